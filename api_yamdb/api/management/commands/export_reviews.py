@@ -0,0 +1,35 @@
+from django.core.management import BaseCommand, CommandError
+from rest_framework.exceptions import ValidationError
+
+from api.v1.export import iter_reviews_ndjson, parse_since
+from reviews.models import Review
+
+
+class Command(BaseCommand):
+    help = 'Выгружает отзывы в формате NDJSON в стандартный вывод.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--title', type=int, help='Выгрузить отзывы одного произведения.'
+        )
+        parser.add_argument(
+            '--since',
+            help='Отзывы, опубликованные не раньше даты или времени ISO 8601.'
+        )
+        parser.add_argument(
+            '--comments', action='store_true',
+            help='Вложить в отзывы комментарии.'
+        )
+
+    def handle(self, *args, **options):
+        try:
+            since = parse_since(options['since'])
+        except ValidationError as error:
+            raise CommandError(error.detail['since'][0])
+        reviews = Review.objects.all()
+        if options['title'] is not None:
+            reviews = reviews.filter(title_id=options['title'])
+        for line in iter_reviews_ndjson(
+            reviews, since, with_comments=options['comments']
+        ):
+            self.stdout.write(line, ending='')
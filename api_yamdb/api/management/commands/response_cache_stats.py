@@ -0,0 +1,16 @@
+from django.core.management import BaseCommand
+
+from api.v1.cache import get_response_cache_stats
+
+
+class Command(BaseCommand):
+    help = 'Выводит статистику попаданий в кэш ответов API.'
+
+    def handle(self, *args, **options):
+        hits, misses = get_response_cache_stats()
+        total = hits + misses
+        ratio = hits / total * 100 if total else 0
+        self.stdout.write(
+            f'Попаданий: {hits}, промахов: {misses}, '
+            f'доля попаданий: {ratio:.1f}%'
+        )
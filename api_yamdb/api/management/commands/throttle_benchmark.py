@@ -0,0 +1,60 @@
+import tempfile
+import time
+
+from django.conf import settings
+from django.core.cache.backends.filebased import FileBasedCache
+from django.core.management import BaseCommand
+from rest_framework.test import APIRequestFactory
+
+from api.v1.throttling import THROTTLE_CACHE_ALIAS
+from api.v1.views import SignUpView, TokenView
+
+
+class Command(BaseCommand):
+    help = (
+        'Измеряет накладные расходы ограничения частоты запросов '
+        'регистрации и получения токена на один запрос. Корзины '
+        'хранятся во временном кэше с настройками кэша ограничений, '
+        'который удаляется после замера, поэтому рабочие корзины '
+        'не затрагиваются.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--requests', type=int, default=1000,
+            help='Количество проверок на каждый эндпоинт.'
+        )
+
+    def handle(self, *args, **options):
+        params = settings.CACHES[THROTTLE_CACHE_ALIAS]
+        with tempfile.TemporaryDirectory() as location:
+            self.run_benchmark(
+                FileBasedCache(location, params), options['requests']
+            )
+
+    def run_benchmark(self, cache, count):
+        count = max(count, 1)
+        factory = APIRequestFactory()
+        for view_class in (SignUpView, TokenView):
+            view = view_class()
+            throttles = [
+                throttle(cache=cache) for throttle in view.throttle_classes
+            ]
+            requests = [
+                view.initialize_request(factory.post(
+                    '/', {'username': f'bench{idx}',
+                          'email': f'bench{idx}@yamdb.fake'},
+                    format='json',
+                    REMOTE_ADDR=f'198.51.{idx // 256 % 256}.{idx % 256}',
+                ))
+                for idx in range(count)
+            ]
+            started = time.perf_counter()
+            for request in requests:
+                for throttle in throttles:
+                    throttle.allow_request(request, view)
+            elapsed = (time.perf_counter() - started) / count * 1000
+            self.stdout.write(
+                f'{view_class.__name__}: {elapsed:.3f} мс на запрос '
+                f'(временный кэш {cache.__class__.__name__})'
+            )
@@ -1,4 +1,5 @@
 from django.contrib.auth.validators import UnicodeUsernameValidator
+from django.db.models import Avg
 from rest_framework import serializers
 from rest_framework.relations import SlugRelatedField
 
@@ -55,6 +56,29 @@ class GenreSerializer(serializers.ModelSerializer):
         fields = ('name', 'slug')
 
 
+class TitleRatingProvider:
+    """Средние оценки страницы произведений, полученные одним запросом."""
+
+    def __init__(self, titles):
+        self.title_ids = {title.id for title in titles}
+        self.ratings = dict(
+            Review.objects.filter(
+                title__in=self.title_ids
+            ).order_by().values('title').annotate(
+                rating=Avg('score')
+            ).values_list('title', 'rating')
+        )
+
+    def __contains__(self, title):
+        return title.id in self.title_ids
+
+    def get_rating(self, title):
+        rating = self.ratings.get(title.id)
+        if rating is None:
+            return None
+        return round(rating)
+
+
 class TitleReadSerializer(serializers.ModelSerializer):
     genre = GenreSerializer(many=True)
     category = CategorySerializer(many=False)
@@ -68,13 +92,27 @@ class TitleReadSerializer(serializers.ModelSerializer):
             'id', 'name', 'year', 'rating', 'description', 'genre', 'category'
         )
 
+    def get_rating_provider(self, obj):
+        """Провайдер рейтинга из контекста или для всей текущей страницы.
+
+        Вызывающий код может передать TitleRatingProvider в контексте
+        под ключом rating_provider. Если его нет или он не содержит
+        произведения, провайдер создаётся лениво для всех объектов
+        родительского ListSerializer (или для одного объекта) и
+        сохраняется в контексте для остальных произведений страницы.
+        """
+        provider = self.context.get('rating_provider')
+        if provider is not None and obj in provider:
+            return provider
+        titles = [obj]
+        if isinstance(self.parent, serializers.ListSerializer):
+            titles = self.parent.instance
+        provider = TitleRatingProvider(titles)
+        self.context['rating_provider'] = provider
+        return provider
+
     def get_rating(self, obj):
-        total_scores = []
-        for review in Review.objects.filter(title=obj.id):
-            total_scores.append(review.score)
-        if not total_scores:
-            return None
-        return round(sum(total_scores) / len(total_scores))
+        return self.get_rating_provider(obj).get_rating(obj)
 
 
 class TitlePostSerializer(serializers.ModelSerializer):
@@ -90,7 +128,7 @@ class TitlePostSerializer(serializers.ModelSerializer):
         fields = '__all__'
 
     def to_representation(self, value):
-        return TitleReadSerializer(value).data
+        return TitleReadSerializer(value, context=self.context).data
 
 
 class ReviewSerializer(serializers.ModelSerializer):
@@ -0,0 +1,173 @@
+import copy
+import threading
+import time
+from collections import OrderedDict
+
+from django.core.cache import caches
+from django.db import transaction
+from django.utils.functional import cached_property
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import AccessToken
+
+from api_yamdb.settings import AUTH_USER_CACHE_SIZE, AUTH_USER_CACHE_TTL
+from users.models import User
+
+ROLE_CLAIM = 'role'
+SUPERUSER_CLAIM = 'is_superuser'
+TOKEN_VERSION_CLAIM = 'token_version'
+# Версия токенов удалённого или неактивного пользователя.
+REVOKED_VERSION = -1
+TOKEN_VERSION_CACHE_ALIAS = 'tokens'
+
+
+class UserCache:
+    """Ограниченный LRU-кэш пользователей процесса со сроком жизни записей.
+
+    Хранит пользователей по id и отдаёт копии, чтобы изменения объекта
+    в одном запросе не попадали в другие. Сигналы сбрасывают запись при
+    сохранении и удалении пользователя в этом процессе; изменения из
+    других процессов видны не позже чем через ttl секунд.
+    """
+
+    def __init__(self, maxsize, ttl):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._users = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, user_id):
+        with self._lock:
+            entry = self._users.get(user_id)
+            if entry is None:
+                return None
+            user, expires = entry
+            if expires <= time.monotonic():
+                del self._users[user_id]
+                return None
+            self._users.move_to_end(user_id)
+        return copy.copy(user)
+
+    def set(self, user_id, user):
+        if self.maxsize <= 0:
+            return
+        user = copy.copy(user)
+        with self._lock:
+            self._users[user_id] = (user, time.monotonic() + self.ttl)
+            self._users.move_to_end(user_id)
+            while len(self._users) > self.maxsize:
+                self._users.popitem(last=False)
+
+    def invalidate(self, user_id):
+        with self._lock:
+            self._users.pop(user_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._users.clear()
+
+
+user_cache = UserCache(AUTH_USER_CACHE_SIZE, AUTH_USER_CACHE_TTL)
+
+
+class RoleAccessToken(AccessToken):
+    """Токен доступа с ролью пользователя и версией его токенов."""
+
+    @classmethod
+    def for_user(cls, user):
+        token = super().for_user(user)
+        token[ROLE_CLAIM] = user.role
+        token[SUPERUSER_CLAIM] = user.is_superuser
+        token[TOKEN_VERSION_CLAIM] = user.token_version
+        return token
+
+
+class RoleTokenUser(TokenUser):
+    """Пользователь из утверждений токена: права проверяются без БД."""
+
+    @cached_property
+    def role(self):
+        return self.token[ROLE_CLAIM]
+
+    def is_admin(self):
+        return self.role == User.ADMIN or self.is_superuser
+
+    def is_moderator(self):
+        return self.role == User.MODERATOR
+
+
+def get_token_version_key(user_id):
+    return f'token-version:{user_id}'
+
+
+def get_token_version(user_id):
+    """Текущая версия токенов пользователя из кэша, при промахе — из БД.
+
+    Кэш 'tokens' общий для процессов: сброс версии при изменении прав
+    в одном процессе сразу отзывает токены во всех остальных.
+    """
+    cache = caches[TOKEN_VERSION_CACHE_ALIAS]
+    key = get_token_version_key(user_id)
+    version = cache.get(key)
+    if version is None:
+        version = User.objects.filter(
+            pk=user_id, is_active=True
+        ).values_list('token_version', flat=True).first()
+        if version is None:
+            version = REVOKED_VERSION
+        cache.set(key, version, AUTH_USER_CACHE_TTL)
+    return version
+
+
+def invalidate_token_version(user_id):
+    """Сбрасывает версию сразу и ещё раз после фиксации транзакции:
+    иначе параллельный запрос успел бы закэшировать старую версию."""
+    key = get_token_version_key(user_id)
+    caches[TOKEN_VERSION_CACHE_ALIAS].delete(key)
+    transaction.on_commit(
+        lambda: caches[TOKEN_VERSION_CACHE_ALIAS].delete(key)
+    )
+
+
+def get_request_user(user):
+    """Модель пользователя запроса: для пользователя из токена — из БД."""
+    if isinstance(user, TokenUser):
+        return User.objects.get(pk=user.id)
+    return user
+
+
+def get_author_fields(user):
+    """Поля автора нового объекта: загруженная модель пользователя или
+    только id для пользователя из токена."""
+    if isinstance(user, TokenUser):
+        return {'author_id': user.id}
+    return {'author': user}
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """JWT-аутентификация без запроса пользователя к БД.
+
+    Токены с ролью и версией дают пользователя из утверждений токена;
+    версия сверяется с кэшем, поэтому изменение прав отзывает выданные
+    токены. Для токенов без этих утверждений пользователь берётся из
+    кэша процесса, в установившемся режиме тоже без запроса к БД.
+    """
+
+    def get_user(self, validated_token):
+        user_id = validated_token.get(api_settings.USER_ID_CLAIM)
+        if user_id is None:
+            return super().get_user(validated_token)
+        if TOKEN_VERSION_CLAIM in validated_token:
+            version = validated_token[TOKEN_VERSION_CLAIM]
+            if get_token_version(user_id) != version:
+                raise AuthenticationFailed(
+                    'Токен отозван.', code='token_revoked'
+                )
+            return RoleTokenUser(validated_token)
+        user = user_cache.get(str(user_id))
+        if user is None:
+            user = super().get_user(validated_token)
+            user_cache.set(str(user_id), user)
+        return user
@@ -0,0 +1,163 @@
+import time
+from hashlib import md5
+from urllib.parse import urlencode
+
+from django.core.cache import cache
+from django.db import DatabaseError, connection, transaction
+
+from api_yamdb.settings import COUNT_CACHE_TIMEOUT, RESPONSE_CACHE_TIMEOUT
+
+RESPONSE_CACHE_HITS_KEY = 'response-cache:hits'
+RESPONSE_CACHE_MISSES_KEY = 'response-cache:misses'
+
+
+def get_version(namespace):
+    """Версия данных пространства имён: время последнего изменения
+    в целых секундах."""
+    key = f'version:{namespace}'
+    version = cache.get(key)
+    if version is None:
+        version = int(time.time())
+        if not cache.add(key, version, None):
+            version = cache.get(key, version)
+    return version
+
+
+def bump_version(*namespaces):
+    """Делает устаревшими все закэшированные ответы пространств имён.
+
+    Версия становится текущим временем в секундах, но растёт не меньше
+    чем на единицу: Last-Modified меняется и при нескольких изменениях
+    за одну секунду. Приращение через incr, чтобы одновременные
+    изменения не получили одну и ту же версию.
+    """
+    now = int(time.time())
+    keys = [f'version:{namespace}' for namespace in namespaces]
+    versions = cache.get_many(keys)
+    for key in keys:
+        version = versions.get(key)
+        if version is None:
+            if cache.add(key, now, None):
+                continue
+            version = now
+        try:
+            cache.incr(key, max(1, now - int(version)))
+        except ValueError:
+            cache.set(key, now, None)
+
+
+def bump_version_on_commit(*namespaces):
+    """Повышает версии после фиксации текущей транзакции.
+
+    Иначе параллельный запрос успел бы закэшировать ещё не изменённые
+    данные под новой версией. Вне транзакции версии повышаются сразу.
+    """
+    transaction.on_commit(lambda: bump_version(*namespaces))
+
+
+def get_request_digest(request):
+    """Хэш адреса запроса с нормализованной строкой запроса."""
+    query = urlencode(sorted(
+        (name, value)
+        for name, values in request.query_params.lists()
+        for value in values
+    ))
+    url = request.build_absolute_uri(request.path)
+    return md5(f'{url}?{query}'.encode('utf-8')).hexdigest()
+
+
+def get_response_cache_key(namespaces, request):
+    """Ключ ответа: версии данных, адрес и нормализованная строка запроса."""
+    versions = ':'.join(str(get_version(name)) for name in namespaces)
+    return f'response:{versions}:{get_request_digest(request)}'
+
+
+def get_validators(namespaces, request):
+    """ETag и Last-Modified ответа по версиям данных без запросов к БД."""
+    versions = [get_version(name) for name in namespaces]
+    digest = md5(':'.join((
+        get_request_digest(request),
+        request.accepted_media_type or '',
+        *map(str, versions),
+    )).encode('utf-8')).hexdigest()
+    return f'"{digest}"', int(max(versions))
+
+
+def get_cached_response(key):
+    cached = cache.get(key)
+    if cached is None:
+        stats_key = RESPONSE_CACHE_MISSES_KEY
+    else:
+        stats_key = RESPONSE_CACHE_HITS_KEY
+    cache.add(stats_key, 0, None)
+    try:
+        cache.incr(stats_key)
+    except ValueError:
+        pass
+    return cached
+
+
+def set_cached_response(key, data):
+    cache.set(key, data, RESPONSE_CACHE_TIMEOUT)
+
+
+def get_response_cache_stats():
+    stats = cache.get_many(
+        (RESPONSE_CACHE_HITS_KEY, RESPONSE_CACHE_MISSES_KEY)
+    )
+    return (
+        stats.get(RESPONSE_CACHE_HITS_KEY, 0),
+        stats.get(RESPONSE_CACHE_MISSES_KEY, 0),
+    )
+
+
+def get_count_key(model, **scope):
+    """Ключ кэша количества объектов модели в пределах родителя."""
+    scope = ','.join(
+        f'{name}={value}' for name, value in sorted(scope.items())
+    )
+    return f'count:{model._meta.label_lower}:{scope}'
+
+
+def get_cached_count(queryset, **scope):
+    """Количество объектов из кэша, при промахе — точный COUNT(*)."""
+    key = get_count_key(queryset.model, **scope)
+    count = cache.get(key)
+    if count is None:
+        count = queryset.count()
+        cache.set(key, count, COUNT_CACHE_TIMEOUT)
+    return count
+
+
+def invalidate_count(model, **scope):
+    cache.delete(get_count_key(model, **scope))
+
+
+def invalidate_count_on_commit(model, **scope):
+    """Сбрасывает количество после фиксации текущей транзакции, чтобы
+    параллельный запрос не закэшировал его до появления изменений."""
+    transaction.on_commit(lambda: invalidate_count(model, **scope))
+
+
+def get_approximate_count(model):
+    """Оценка количества строк таблицы по статистике БД.
+
+    Возвращает None, если статистика не собрана или СУБД не поддерживается.
+    """
+    table = model._meta.db_table
+    if connection.vendor == 'postgresql':
+        sql = 'SELECT reltuples::bigint FROM pg_class WHERE relname = %s'
+    elif connection.vendor == 'sqlite':
+        sql = 'SELECT stat FROM sqlite_stat1 WHERE tbl = %s LIMIT 1'
+    else:
+        return None
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(sql, (table,))
+            row = cursor.fetchone()
+    except DatabaseError:
+        return None
+    if row is None:
+        return None
+    estimate = int(str(row[0]).split()[0])
+    return estimate if estimate >= 0 else None
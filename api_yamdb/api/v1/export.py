@@ -0,0 +1,96 @@
+import json
+from datetime import datetime, time
+from itertools import groupby, islice
+
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from rest_framework.exceptions import ValidationError
+from rest_framework.utils.encoders import JSONEncoder
+
+from api_yamdb.settings import EXPORT_CHUNK_SIZE
+from reviews.models import Comment
+from .serializers import BulkReviewSerializer, CommentSerializer
+
+NDJSON_CONTENT_TYPE = 'application/x-ndjson'
+
+
+def parse_since(value):
+    """Начало выгрузки из параметра since: дата или дата и время ISO 8601.
+
+    Время без часового пояса считается временем проекта.
+    """
+    if not value:
+        return None
+    try:
+        since = parse_datetime(value)
+        if since is None:
+            date = parse_date(value)
+            if date is not None:
+                since = datetime.combine(date, time.min)
+    except ValueError:
+        since = None
+    if since is None:
+        raise ValidationError(
+            {'since': ['Ожидается дата или дата и время в формате ISO 8601.']}
+        )
+    if timezone.is_naive(since):
+        since = timezone.make_aware(since)
+    return since
+
+
+def get_comments_by_review(review_ids):
+    """Комментарии пачки отзывов одним запросом, сгруппированные по отзыву."""
+    comments = Comment.objects.select_related('author').filter(
+        review_id__in=review_ids
+    ).order_by('review_id', 'pub_date', 'id')
+    return {
+        review_id: CommentSerializer(list(group), many=True).data
+        for review_id, group in groupby(
+            comments, key=lambda comment: comment.review_id
+        )
+    }
+
+
+def iter_reviews_ndjson(reviews, since=None, with_comments=False,
+                        chunk_size=EXPORT_CHUNK_SIZE):
+    """Строки NDJSON с отзывами в порядке публикации.
+
+    Отзывы читаются курсором БД пачками по chunk_size, комментарии —
+    одним запросом на пачку, поэтому память не растёт с размером
+    выгрузки.
+    """
+    reviews = reviews.select_related('author').order_by('pub_date', 'id')
+    if since is not None:
+        reviews = reviews.filter(pub_date__gte=since)
+    rows = reviews.iterator(chunk_size=chunk_size)
+    while True:
+        chunk = list(islice(rows, chunk_size))
+        if not chunk:
+            return
+        comments = {}
+        if with_comments:
+            comments = get_comments_by_review(
+                [review.id for review in chunk]
+            )
+        for review in chunk:
+            data = BulkReviewSerializer(review).data
+            if with_comments:
+                data['comments'] = comments.get(review.id, [])
+            yield json.dumps(data, cls=JSONEncoder, ensure_ascii=False) + '\n'
+
+
+def stream_reviews(request, reviews):
+    """Потоковый ответ NDJSON с отзывами.
+
+    Параметры запроса: since — отзывы, опубликованные не раньше указанного
+    времени, expand=comments — вложить комментарии.
+    """
+    since = parse_since(request.query_params.get('since'))
+    with_comments = 'comments' in request.query_params.get(
+        'expand', ''
+    ).split(',')
+    return StreamingHttpResponse(
+        iter_reviews_ndjson(reviews, since, with_comments),
+        content_type=NDJSON_CONTENT_TYPE,
+    )
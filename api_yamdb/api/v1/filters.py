@@ -1,13 +1,105 @@
-from django_filters import CharFilter, FilterSet
+from django.db.models import Exists, OuterRef
+from django_filters import CharFilter, ChoiceFilter, FilterSet, NumberFilter
+from rest_framework.exceptions import ValidationError
+from rest_framework.filters import BaseFilterBackend, OrderingFilter
 
-from reviews.models import Title
+from reviews.models import Category, Genre, GenreTitle, Title
+from reviews.search import search_titles
+
+GENRE_MATCH_ANY = 'any'
+GENRE_MATCH_ALL = 'all'
+GENRE_MATCH_CHOICES = (
+    (GENRE_MATCH_ANY, 'Любой из жанров'),
+    (GENRE_MATCH_ALL, 'Все жанры'),
+)
 
 
 class TitleFilter(FilterSet):
-    category = CharFilter(field_name='category__slug', lookup_expr='icontains')
-    genre = CharFilter(field_name='genre__slug', lookup_expr='icontains')
+    """Фильтр произведений.
+
+    Жанр и категория сравниваются со слагом точно: слаги один раз
+    переводятся в id, а жанры проверяются через EXISTS по индексу
+    (genre_id, title_id) таблицы GenreTitle, без JOIN и DISTINCT.
+    `genre` принимает несколько слагов через запятую, режим сравнения
+    задаёт `genre_match=any|all`.
+    """
+    category = CharFilter(method='filter_category')
+    genre = CharFilter(method='filter_genre')
+    genre_match = ChoiceFilter(
+        choices=GENRE_MATCH_CHOICES, method='filter_genre_match'
+    )
     name = CharFilter(field_name='name', lookup_expr='icontains')
+    rating_min = NumberFilter(field_name='rating', lookup_expr='gte')
+    rating_max = NumberFilter(field_name='rating', lookup_expr='lte')
 
     class Meta:
         model = Title
         fields = ('category', 'genre', 'name', 'year')
+
+    def filter_category(self, queryset, name, value):
+        category_id = Category.objects.filter(
+            slug=value
+        ).values_list('id', flat=True).first()
+        if category_id is None:
+            return queryset.none()
+        return queryset.filter(category_id=category_id)
+
+    def filter_genre(self, queryset, name, value):
+        slugs = {slug.strip() for slug in value.split(',') if slug.strip()}
+        genre_ids = list(
+            Genre.objects.filter(slug__in=slugs).values_list('id', flat=True)
+        )
+        match_all = self.data.get('genre_match') == GENRE_MATCH_ALL
+        if not genre_ids or (match_all and len(genre_ids) < len(slugs)):
+            return queryset.none()
+        genre_titles = GenreTitle.objects.filter(title=OuterRef('pk'))
+        if not match_all:
+            return queryset.filter(
+                Exists(genre_titles.filter(genre_id__in=genre_ids))
+            )
+        for genre_id in genre_ids:
+            queryset = queryset.filter(
+                Exists(genre_titles.filter(genre_id=genre_id))
+            )
+        return queryset
+
+    def filter_genre_match(self, queryset, name, value):
+        return queryset
+
+
+class TitleSearchFilter(BaseFilterBackend):
+    """Полнотекстовый поиск по названию и описанию произведения."""
+    search_param = 'search'
+
+    def filter_queryset(self, request, queryset, view):
+        query = request.query_params.get(self.search_param, '').strip()
+        if not query:
+            return queryset
+        return search_titles(queryset, query)
+
+
+class TitleOrderingFilter(OrderingFilter):
+    """Сортировка произведений по рейтингу, году или названию.
+
+    Сортировка по рейтингу читает индекс сохранённого рейтинга;
+    для устойчивой пагинации порядок дополняется id в том же направлении.
+    Курсорная пагинация упорядочивает страницы по своему ключу, поэтому
+    вместе с ней параметр ordering отклоняется ответом 400.
+    """
+    ordering_fields = ('rating', 'year', 'name')
+
+    def get_ordering(self, request, queryset, view):
+        ordering = super().get_ordering(request, queryset, view)
+        if not ordering:
+            return ordering
+        paginator = getattr(view, 'paginator', None)
+        if (
+            request.query_params.get(self.ordering_param)
+            and hasattr(paginator, 'use_keyset')
+            and paginator.use_keyset(request)
+        ):
+            raise ValidationError({self.ordering_param: [
+                'Сортировка недоступна при курсорной пагинации: '
+                'страницы упорядочены по названию, году и id.'
+            ]})
+        return (*ordering, '-id' if ordering[0].startswith('-') else 'id')
@@ -0,0 +1,135 @@
+from django.core.exceptions import ImproperlyConfigured
+from django.shortcuts import get_object_or_404
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+from rest_framework import status
+from rest_framework.response import Response
+
+from .cache import (
+    get_cached_response, get_response_cache_key, get_validators,
+    set_cached_response
+)
+
+
+class CacheNamespacesMixin:
+    """Пространства имён версий данных, от которых зависит ответ."""
+    cache_namespaces = ()
+
+    def get_cache_namespaces(self):
+        return self.cache_namespaces
+
+
+class CachedListMixin(CacheNamespacesMixin):
+    """Кэширование ответов на чтение до изменения данных.
+
+    Ключ ответа включает версии пространств имён `get_cache_namespaces()`,
+    которые повышаются сигналами при изменении связанных моделей.
+    """
+
+    def get_cached_response(self, handler, request, *args, **kwargs):
+        key = get_response_cache_key(self.get_cache_namespaces(), request)
+        data = get_cached_response(key)
+        if data is not None:
+            response = Response(data)
+            response['X-Cache'] = 'HIT'
+            return response
+        response = handler(request, *args, **kwargs)
+        if response.status_code == status.HTTP_200_OK:
+            set_cached_response(key, response.data)
+        response['X-Cache'] = 'MISS'
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self.get_cached_response(
+            super().list, request, *args, **kwargs
+        )
+
+
+class CachedResponseMixin(CachedListMixin):
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.get_cached_response(
+            super().retrieve, request, *args, **kwargs
+        )
+
+
+class ConditionalListMixin(CacheNamespacesMixin):
+    """Условные GET-запросы: ETag, Last-Modified и ответ 304.
+
+    Валидаторы строятся по версиям данных из кэша, поэтому ответ 304
+    отдаётся без основного запроса к БД и без сериализации.
+    """
+
+    def get_conditional_response(self, handler, request, *args, **kwargs):
+        etag, last_modified = get_validators(
+            self.get_cache_namespaces(), request
+        )
+        response = get_conditional_response(
+            request, etag=etag, last_modified=last_modified
+        )
+        if response is not None:
+            return response
+        response = handler(request, *args, **kwargs)
+        if response.status_code == status.HTTP_200_OK:
+            response['ETag'] = etag
+            response['Last-Modified'] = http_date(last_modified)
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self.get_conditional_response(
+            super().list, request, *args, **kwargs
+        )
+
+
+class ConditionalGetMixin(ConditionalListMixin):
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.get_conditional_response(
+            super().retrieve, request, *args, **kwargs
+        )
+
+
+class NestedParentMixin:
+    """Родительские объекты вложенных маршрутов.
+
+    Каждый родитель загружается не более одного раза за запрос и хранится
+    на объекте запроса. Списки фильтруются по id родителя из URL, а сам
+    родитель запрашивается, только когда он действительно нужен: при
+    создании объекта или для ответа 404 на пустой странице.
+
+    Непосредственный родитель задаётся атрибутами `parent_model` и
+    `parent_lookup_kwargs` — полями модели и аргументами URL с их
+    значениями.
+    """
+    parent_model = None
+    parent_lookup_kwargs = {}
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if cls.parent_model is None or not cls.parent_lookup_kwargs:
+            raise ImproperlyConfigured(
+                f'{cls.__name__} должен задать parent_model '
+                'и parent_lookup_kwargs.'
+            )
+
+    def get_parent(self, model, **lookup):
+        parents = getattr(self.request, '_parent_objects', None)
+        if parents is None:
+            parents = self.request._parent_objects = {}
+        key = (model, tuple(sorted(lookup.items())))
+        if key not in parents:
+            parents[key] = get_object_or_404(model, **lookup)
+        return parents[key]
+
+    def get_parent_object(self):
+        """Непосредственный родитель по аргументам URL или 404."""
+        return self.get_parent(self.parent_model, **{
+            field: self.kwargs.get(kwarg)
+            for field, kwarg in self.parent_lookup_kwargs.items()
+        })
+
+    def paginate_queryset(self, queryset):
+        page = super().paginate_queryset(queryset)
+        if not page:
+            self.get_parent_object()
+        return page
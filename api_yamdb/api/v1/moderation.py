@@ -0,0 +1,121 @@
+from django.db import transaction
+from django.db.models import Count
+
+from api_yamdb.settings import MODERATION_CHUNK_SIZE
+from reviews.models import Comment, Review
+from reviews.ratings import recalculate_score_counts, recalculate_title_ratings
+from .cache import bump_version, invalidate_count
+
+DELETE = 'delete'
+REPLACE_TEXT = 'replace_text'
+ACTIONS = (DELETE, REPLACE_TEXT)
+
+REVIEWS = 'reviews'
+COMMENTS = 'comments'
+TARGETS = (REVIEWS, COMMENTS)
+
+
+def get_moderated_queryset(target, ids=None, author=None):
+    """Отзывы или комментарии по списку id и/или имени автора."""
+    model = Review if target == REVIEWS else Comment
+    queryset = model.objects.all()
+    if ids:
+        queryset = queryset.filter(id__in=ids)
+    if author:
+        queryset = queryset.filter(author__username=author)
+    return queryset
+
+
+def moderate_reviews(action, reviews, text=None):
+    """Удаляет отзывы или заменяет их текст.
+
+    Затронутые произведения и количество отзывов собираются одним
+    запросом с группировкой, изменения выполняются запросами с
+    подзапросом, без списков id. Удаление — DELETE отзывов и их
+    комментариев без загрузки объектов и сигналов; рейтинги и счётчики
+    оценок затронутых произведений пересчитываются один раз, пачками по
+    MODERATION_CHUNK_SIZE произведений.
+    """
+    with transaction.atomic():
+        counts = dict(
+            reviews.order_by().values_list('title_id').annotate(
+                total=Count('id')
+            )
+        )
+        title_ids = sorted(counts)
+        summary = {'affected': sum(counts.values()), 'titles': title_ids}
+        if not counts:
+            return summary
+        review_ids = reviews.values('id')
+        if action == REPLACE_TEXT:
+            Review.objects.filter(id__in=review_ids).update(text=text)
+        else:
+            comments = Comment.objects.filter(review_id__in=review_ids)
+            summary['deleted'] = {
+                COMMENTS: comments._raw_delete(comments.db),
+                REVIEWS: Review.objects.filter(
+                    id__in=review_ids
+                )._raw_delete(reviews.db),
+            }
+            for start in range(0, len(title_ids), MODERATION_CHUNK_SIZE):
+                chunk = title_ids[start:start + MODERATION_CHUNK_SIZE]
+                recalculate_title_ratings(chunk)
+                recalculate_score_counts(chunk)
+    namespaces = [f'reviews:title:{title_id}' for title_id in title_ids]
+    if action == DELETE:
+        namespaces += ['titles'] + [
+            f'comments:title:{title_id}' for title_id in title_ids
+        ]
+        for title_id in title_ids:
+            invalidate_count(Review, title_id=title_id)
+    bump_version(*namespaces)
+    return summary
+
+
+def moderate_comments(action, comments, text=None):
+    """Удаляет комментарии или заменяет их текст.
+
+    Затронутые отзывы собираются одним запросом с группировкой,
+    изменения выполняются запросом с подзапросом.
+    """
+    with transaction.atomic():
+        rows = comments.order_by().values_list(
+            'review_id', 'review__title_id'
+        ).annotate(total=Count('id'))
+        counts = {
+            (review_id, title_id): total
+            for review_id, title_id, total in rows
+        }
+        title_ids = sorted({title_id for _, title_id in counts})
+        summary = {'affected': sum(counts.values()), 'titles': title_ids}
+        if not counts:
+            return summary
+        moderated = Comment.objects.filter(id__in=comments.values('id'))
+        if action == REPLACE_TEXT:
+            moderated.update(text=text)
+        else:
+            summary['deleted'] = {
+                COMMENTS: moderated._raw_delete(moderated.db)
+            }
+    if action == DELETE:
+        for review_id, title_id in counts:
+            invalidate_count(Comment, review_id=review_id, title_id=title_id)
+    bump_version(
+        *(f'comments:review:{review_id}' for review_id, _ in counts),
+        *(f'comments:title:{title_id}' for title_id in title_ids),
+    )
+    return summary
+
+
+def moderate(action, target, ids=None, author=None, text=None):
+    """Массовая модерация: удаление или замена текста одной транзакцией.
+
+    Возвращает сводку: количество затронутых объектов, произведения и,
+    для удаления, количество удалённых отзывов и комментариев.
+    """
+    queryset = get_moderated_queryset(target, ids, author)
+    if target == REVIEWS:
+        summary = moderate_reviews(action, queryset, text)
+    else:
+        summary = moderate_comments(action, queryset, text)
+    return {'action': action, 'target': target, **summary}
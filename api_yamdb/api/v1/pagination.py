@@ -0,0 +1,261 @@
+import json
+from base64 import b64decode, b64encode
+from collections import OrderedDict
+from functools import partial
+
+from django.core.exceptions import ValidationError
+from django.core.paginator import (
+    EmptyPage, Page, PageNotAnInteger, Paginator
+)
+from django.db.models import Q
+from django.utils.functional import cached_property
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
+
+from api_yamdb.settings import APPROXIMATE_COUNT_THRESHOLD
+from .cache import get_approximate_count, get_cached_count
+
+INVALID_CURSOR_MESSAGE = 'Некорректный курсор.'
+
+
+class CountProviderPage(Page):
+    """Страница, о следующей странице которой известно по лишней строке."""
+
+    def __init__(self, object_list, number, paginator, has_next):
+        super().__init__(object_list, number, paginator)
+        self._has_next = has_next
+
+    def has_next(self):
+        return self._has_next
+
+
+class CountProviderPaginator(Paginator):
+    """Django-пагинатор, получающий количество объектов у провайдера.
+
+    Количество из кэша или оценка по статистике может расходиться
+    с данными, поэтому оно только выводится в ответе. Страница
+    выбирается со строкой сверх размера: по ней определяется, есть ли
+    следующая, а пустая страница после первой даёт 404.
+    """
+
+    def __init__(self, object_list, per_page, count_provider=None, **kwargs):
+        super().__init__(object_list, per_page, **kwargs)
+        self.count_provider = count_provider
+
+    @cached_property
+    def count(self):
+        if self.count_provider is None:
+            return super().count
+        return self.count_provider(self.object_list)
+
+    def validate_number(self, number):
+        try:
+            if isinstance(number, float) and not number.is_integer():
+                raise ValueError
+            number = int(number)
+        except (TypeError, ValueError):
+            raise PageNotAnInteger('Номер страницы не является целым числом.')
+        if number < 1:
+            raise EmptyPage('Номер страницы меньше 1.')
+        return number
+
+    def page(self, number):
+        number = self.validate_number(number)
+        bottom = (number - 1) * self.per_page
+        rows = list(self.object_list[bottom:bottom + self.per_page + 1])
+        if not rows and number > 1:
+            raise EmptyPage('На этой странице нет результатов.')
+        return CountProviderPage(
+            rows[:self.per_page], number, self,
+            has_next=len(rows) > self.per_page,
+        )
+
+
+class CachedCountPagination(PageNumberPagination):
+    """Постраничный вывод с кэшированным количеством объектов.
+
+    Представление задаёт область подсчёта методом `get_count_scope()`:
+    словарь с родителем (`{'title_id': 1}`) или пустой словарь для всего
+    списка. Количество кэшируется по области и сбрасывается сигналами
+    при создании и удалении объектов. Запросы с фильтрами считаются точно.
+    Для больших нефильтрованных списков можно включить оценку количества
+    по статистике БД через `APPROXIMATE_COUNT_THRESHOLD`.
+    """
+    unfiltered_query_params = ('page', 'pagination', 'ordering')
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.django_paginator_class = partial(
+            CountProviderPaginator,
+            count_provider=self.get_count_provider(request, view),
+        )
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_count_provider(self, request, view):
+        get_count_scope = getattr(view, 'get_count_scope', None)
+        if get_count_scope is None:
+            return None
+        if set(request.query_params) - set(self.unfiltered_query_params):
+            return None
+        scope = get_count_scope()
+        if not scope and APPROXIMATE_COUNT_THRESHOLD is not None:
+            return self.get_approximate_count
+        return partial(self.get_cached_count, scope=scope)
+
+    @staticmethod
+    def get_cached_count(queryset, scope):
+        return get_cached_count(queryset, **scope)
+
+    @staticmethod
+    def get_approximate_count(queryset):
+        estimate = get_approximate_count(queryset.model)
+        if estimate is not None and estimate >= APPROXIMATE_COUNT_THRESHOLD:
+            return estimate
+        return get_cached_count(queryset)
+
+
+class KeysetPagination(BasePagination):
+    """Пагинация по ключу сортировки: без COUNT(*) и без OFFSET.
+
+    Курсор хранит значения полей сортировки крайнего объекта страницы,
+    следующая страница выбирается условием «после этих значений»,
+    поэтому глубокие страницы стоят столько же, сколько первая.
+    """
+    cursor_query_param = 'cursor'
+    page_size = api_settings.PAGE_SIZE
+
+    def __init__(self, ordering):
+        self.ordering = ordering
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.base_url = request.build_absolute_uri()
+        self.values, self.reverse = self.decode_cursor(request)
+        ordering = self.get_ordering()
+        queryset = queryset.order_by(*ordering)
+        if self.values is not None:
+            try:
+                queryset = queryset.filter(
+                    self.get_keyset_filter(ordering, self.values)
+                )
+            except (TypeError, ValueError, ValidationError):
+                raise NotFound(INVALID_CURSOR_MESSAGE)
+        page = list(queryset[:self.page_size + 1])
+        self.has_more = len(page) > self.page_size
+        page = page[:self.page_size]
+        if self.reverse:
+            page.reverse()
+        self.page = page
+        return page
+
+    def get_paginated_response(self, data):
+        return Response(OrderedDict([
+            ('next', self.get_next_link()),
+            ('previous', self.get_previous_link()),
+            ('results', data),
+        ]))
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'properties': {
+                'next': {'type': 'string', 'nullable': True},
+                'previous': {'type': 'string', 'nullable': True},
+                'results': schema,
+            },
+        }
+
+    def get_ordering(self):
+        if not self.reverse:
+            return self.ordering
+        return tuple(
+            field[1:] if field.startswith('-') else f'-{field}'
+            for field in self.ordering
+        )
+
+    @staticmethod
+    def get_keyset_filter(ordering, values):
+        """Условие «строка идёт после values» для составного ключа."""
+        keyset_filter = Q()
+        equal = {}
+        for field, value in zip(ordering, values):
+            name = field.lstrip('-')
+            lookup = 'lt' if field.startswith('-') else 'gt'
+            keyset_filter |= Q(**equal, **{f'{name}__{lookup}': value})
+            equal[name] = value
+        return keyset_filter
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded is None:
+            return None, False
+        try:
+            cursor = json.loads(b64decode(encoded.encode('ascii')))
+            values, reverse = cursor['v'], bool(cursor['r'])
+        except (TypeError, ValueError, KeyError):
+            raise NotFound(INVALID_CURSOR_MESSAGE)
+        if not isinstance(values, list) or len(values) != len(self.ordering):
+            raise NotFound(INVALID_CURSOR_MESSAGE)
+        return values, reverse
+
+    def encode_cursor(self, obj, reverse):
+        values = [
+            obj._meta.get_field(field.lstrip('-')).value_to_string(obj)
+            for field in self.ordering
+        ]
+        cursor = json.dumps({'v': values, 'r': int(reverse)})
+        return replace_query_param(
+            self.base_url, self.cursor_query_param,
+            b64encode(cursor.encode('utf-8')).decode('ascii')
+        )
+
+    def get_next_link(self):
+        if not self.page or not (self.has_more or self.reverse):
+            return None
+        return self.encode_cursor(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not self.page:
+            return None
+        if self.reverse and not self.has_more:
+            return None
+        if not self.reverse and self.values is None:
+            return None
+        return self.encode_cursor(self.page[0], reverse=True)
+
+
+class PageNumberOrKeysetPagination(CachedCountPagination):
+    """Постраничный вывод по номеру страницы с курсорным режимом по запросу.
+
+    Курсорный режим включается параметром `?pagination=cursor`
+    или наличием параметра `cursor`.
+    """
+    pagination_query_param = 'pagination'
+    keyset_ordering = ('id',)
+
+    def use_keyset(self, request):
+        return (
+            request.query_params.get(self.pagination_query_param) == 'cursor'
+            or KeysetPagination.cursor_query_param in request.query_params
+        )
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.keyset = None
+        if self.use_keyset(request):
+            self.keyset = KeysetPagination(self.keyset_ordering)
+            return self.keyset.paginate_queryset(queryset, request, view)
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        if self.keyset is not None:
+            return self.keyset.get_paginated_response(data)
+        return super().get_paginated_response(data)
+
+
+class TitlePagination(PageNumberOrKeysetPagination):
+    keyset_ordering = ('name', 'year', 'id')
+
+
+class PubDatePagination(PageNumberOrKeysetPagination):
+    keyset_ordering = ('-pub_date', 'id')
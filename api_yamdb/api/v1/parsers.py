@@ -0,0 +1,27 @@
+import codecs
+import csv
+
+from django.conf import settings
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import BaseParser
+
+
+class CSVParser(BaseParser):
+    """Разбирает CSV с заголовком в список словарей по строкам."""
+    media_type = 'text/csv'
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get('encoding', settings.DEFAULT_CHARSET)
+        try:
+            reader = csv.DictReader(codecs.iterdecode(stream, encoding))
+            return [
+                {
+                    name.strip(): value.strip()
+                    for name, value in row.items()
+                    if name and value is not None
+                }
+                for row in reader
+            ]
+        except (csv.Error, UnicodeDecodeError) as error:
+            raise ParseError(f'Некорректный CSV: {error}')
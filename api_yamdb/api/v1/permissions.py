@@ -26,7 +26,7 @@ class IsAuthorAdminSuperuserOrReadOnlyPermission(permissions.BasePermission):
         return (request.method in permissions.SAFE_METHODS
                 or (request.user.is_admin()
                     or request.user.is_moderator()
-                    or obj.author == request.user))
+                    or obj.author_id == request.user.id))
 
 
 class IsAdminPermission(permissions.BasePermission):
@@ -34,3 +34,12 @@ class IsAdminPermission(permissions.BasePermission):
 
     def has_permission(self, request, view):
         return request.user.is_authenticated and request.user.is_admin()
+
+
+class IsModeratorAdminPermission(permissions.BasePermission):
+    """Права доступа: модератор, администратор или суперпользователь."""
+
+    def has_permission(self, request, view):
+        return request.user.is_authenticated and (
+            request.user.is_admin() or request.user.is_moderator()
+        )
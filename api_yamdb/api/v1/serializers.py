@@ -1,12 +1,16 @@
 from django.contrib.auth.validators import UnicodeUsernameValidator
+from django.db import IntegrityError, transaction
 from rest_framework import serializers
 from rest_framework.relations import SlugRelatedField
+from rest_framework.settings import api_settings
 
 from reviews.models import Category, Comment, Review, Genre, Title
 from users.models import User
 from api_yamdb.settings import (
-    MAX_LENGTH_EMAIL, MAX_LENGTH_USERNAME, MAX_LENGTH_CONFIRMATION_CODE
+    MAX_LENGTH_EMAIL, MAX_LENGTH_USERNAME, MAX_LENGTH_CONFIRMATION_CODE,
+    MODERATION_MAX_IDS
 )
+from .moderation import ACTIONS, REPLACE_TEXT, TARGETS
 from .validators import validate_username
 
 
@@ -32,6 +36,22 @@ class CustomUserSerializer(serializers.ModelSerializer):
         )
 
 
+class BulkUserSerializer(CustomUserSerializer):
+    """Строка массового импорта пользователей.
+
+    Уникальность username и email проверяется для всей пачки сразу,
+    поэтому валидаторы уникальности полей отключены.
+    """
+
+    class Meta(CustomUserSerializer.Meta):
+        extra_kwargs = {
+            'username': {'validators': [
+                UnicodeUsernameValidator(), validate_username
+            ]},
+            'email': {'validators': []},
+        }
+
+
 class TokenSerializer(serializers.Serializer):
     """Сериализатор для запроса на получение токена."""
     username = serializers.CharField(
@@ -81,7 +101,7 @@ class TitlePostSerializer(serializers.ModelSerializer):
         fields = '__all__'
 
     def to_representation(self, value):
-        return TitleReadSerializer(value).data
+        return TitleReadSerializer(value, context=self.context).data
 
 
 class ReviewSerializer(serializers.ModelSerializer):
@@ -91,16 +111,58 @@ class ReviewSerializer(serializers.ModelSerializer):
         fields = ('id', 'text', 'author', 'score', 'pub_date')
         model = Review
 
-    def validate(self, data):
-        request = self.context['request']
-        author = request.user
-        title_id = self.context['view'].kwargs.get('title_id')
-        if request.method == 'POST':
-            if Review.objects.filter(title=title_id, author=author).exists():
-                raise serializers.ValidationError(
-                    'Можно создать только 1 отзыв на 1 произведение'
+    def create(self, validated_data):
+        """Создаёт отзыв без предварительных проверок.
+
+        Повторный отзыв отсекает ограничение unique_author_title, а
+        существование произведения подтверждает UPDATE его рейтинга
+        (при отключённых сигналах — отдельный запрос). Для отсутствующего
+        произведения поднимается Title.DoesNotExist. Причина
+        IntegrityError определяется запросами, поэтому не зависит от
+        того, какое ограничение СУБД проверяет первым.
+        """
+        try:
+            with transaction.atomic():
+                review = super().create(validated_data)
+                if not title_exists(review):
+                    raise Title.DoesNotExist(
+                        f'Произведение {review.title_id} не найдено.'
+                    )
+        except IntegrityError:
+            title_id = validated_data['title_id']
+            author_id = validated_data.get('author_id') or (
+                validated_data['author'].id
+            )
+            if Review.objects.filter(
+                author_id=author_id, title_id=title_id
+            ).exists():
+                raise serializers.ValidationError({
+                    api_settings.NON_FIELD_ERRORS_KEY: [
+                        'Можно создать только 1 отзыв на 1 произведение'
+                    ]
+                })
+            if not Title.objects.filter(pk=title_id).exists():
+                raise Title.DoesNotExist(
+                    f'Произведение {title_id} не найдено.'
                 )
-        return data
+            raise
+        return review
+
+
+def title_exists(review):
+    """Существует ли произведение нового отзыва."""
+    updated = getattr(review, 'title_rating_updated', None)
+    if updated is None:
+        return Title.objects.filter(pk=review.title_id).exists()
+    return updated
+
+
+class BulkReviewSerializer(ReviewSerializer):
+    """Отзыв в массовой загрузке: произведение передаётся в теле."""
+    title = serializers.IntegerField(source='title_id')
+
+    class Meta(ReviewSerializer.Meta):
+        fields = ('id', 'title', 'text', 'author', 'score', 'pub_date')
 
 
 class CommentSerializer(serializers.ModelSerializer):
@@ -111,3 +173,38 @@ class CommentSerializer(serializers.ModelSerializer):
     class Meta:
         model = Comment
         fields = ('id', 'text', 'author', 'pub_date')
+
+
+class ReviewWithCommentsSerializer(ReviewSerializer):
+    """Отзыв с последними комментариями из предзагрузки latest_comments."""
+    comments = CommentSerializer(
+        source='latest_comments', many=True, read_only=True
+    )
+
+    class Meta(ReviewSerializer.Meta):
+        fields = ReviewSerializer.Meta.fields + ('comments',)
+
+
+class ModerationSerializer(serializers.Serializer):
+    """Запрос массовой модерации отзывов или комментариев."""
+    action = serializers.ChoiceField(choices=ACTIONS)
+    target = serializers.ChoiceField(choices=TARGETS)
+    ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        required=False, allow_empty=False, max_length=MODERATION_MAX_IDS
+    )
+    author = serializers.CharField(
+        max_length=MAX_LENGTH_USERNAME, required=False
+    )
+    text = serializers.CharField(required=False)
+
+    def validate(self, data):
+        if not data.get('ids') and not data.get('author'):
+            raise serializers.ValidationError(
+                'Укажите список id или автора.'
+            )
+        if data['action'] == REPLACE_TEXT and not data.get('text'):
+            raise serializers.ValidationError(
+                {'text': ['Укажите новый текст.']}
+            )
+        return data
@@ -0,0 +1,146 @@
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from reviews.models import Category, Comment, Genre, GenreTitle, Review, Title
+from reviews.signals import review_signals_suspended
+from users.models import User
+from .authentication import invalidate_token_version, user_cache
+from .cache import bump_version_on_commit, invalidate_count_on_commit
+
+
+@receiver(post_delete, sender=Title)
+def invalidate_title_on_delete(sender, instance, **kwargs):
+    bump_version_on_commit('titles', f'reviews:title:{instance.pk}')
+
+
+@receiver(post_save, sender=Title)
+@receiver(post_save, sender=GenreTitle)
+@receiver(post_delete, sender=GenreTitle)
+def invalidate_titles(sender, **kwargs):
+    bump_version_on_commit('titles')
+
+
+@receiver(m2m_changed, sender=GenreTitle)
+def invalidate_titles_on_genres_change(sender, action, **kwargs):
+    if action.startswith('post_'):
+        bump_version_on_commit('titles')
+
+
+@receiver(post_save, sender=Genre)
+@receiver(post_delete, sender=Genre)
+def invalidate_genres(sender, **kwargs):
+    bump_version_on_commit('genres', 'titles')
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def invalidate_categories(sender, **kwargs):
+    bump_version_on_commit('categories', 'titles')
+
+
+@receiver(post_save, sender=Review)
+def invalidate_reviews_on_save(sender, instance, created, **kwargs):
+    """Рейтинг в ответах меняется только с новой или изменённой оценкой."""
+    if review_signals_suspended():
+        return
+    loaded = getattr(instance, '_loaded_values', {})
+    if created or loaded.get('score') != instance.score:
+        bump_version_on_commit('titles', f'reviews:title:{instance.title_id}')
+    else:
+        bump_version_on_commit(f'reviews:title:{instance.title_id}')
+
+
+@receiver(post_delete, sender=Review)
+def invalidate_reviews_on_delete(sender, instance, **kwargs):
+    if review_signals_suspended():
+        return
+    bump_version_on_commit(
+        'titles',
+        f'reviews:title:{instance.title_id}',
+        f'comments:review:{instance.pk}',
+    )
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def invalidate_comments(sender, instance, created=True, **kwargs):
+    """Сбрасывает списки комментариев отзыва и отзывы произведения
+    с вложенными комментариями, а при создании и удалении — количество
+    комментариев отзыва."""
+    if review_signals_suspended():
+        return
+    if Comment.review.is_cached(instance):
+        title_id = instance.review.title_id
+    else:
+        title_id = Review.objects.filter(
+            pk=instance.review_id
+        ).values_list('title_id', flat=True).first()
+    namespaces = [f'comments:review:{instance.review_id}']
+    if title_id is not None:
+        namespaces.append(f'comments:title:{title_id}')
+        if created:
+            invalidate_count_on_commit(
+                Comment, review_id=instance.review_id, title_id=title_id
+            )
+    bump_version_on_commit(*namespaces)
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_users(sender, **kwargs):
+    bump_version_on_commit('users')
+
+
+@receiver(post_save, sender=User)
+def invalidate_authored_on_rename(sender, instance, created, **kwargs):
+    """Отзывы и комментарии показывают имя автора: при его изменении
+    сбрасываются отзывы произведений, где пользователь писал отзывы или
+    комментарии. Списки комментариев тоже зависят от версии отзывов
+    произведения."""
+    loaded = getattr(instance, '_loaded_username', None)
+    if created or loaded is None or loaded == instance.username:
+        return
+    title_ids = Review.objects.filter(author=instance).order_by(
+    ).values_list('title_id', flat=True).union(
+        Comment.objects.filter(author=instance).order_by().values_list(
+            'review__title_id', flat=True
+        )
+    )
+    bump_version_on_commit(
+        *(f'reviews:title:{title_id}' for title_id in title_ids)
+    )
+
+
+@receiver(post_save, sender=Title)
+@receiver(post_save, sender=User)
+def invalidate_list_count_on_create(sender, instance, created, **kwargs):
+    if created:
+        invalidate_count_on_commit(sender)
+
+
+@receiver(post_delete, sender=Title)
+@receiver(post_delete, sender=User)
+def invalidate_list_count_on_delete(sender, instance, **kwargs):
+    invalidate_count_on_commit(sender)
+
+
+@receiver(post_save, sender=Review)
+def invalidate_review_count_on_create(sender, instance, created, **kwargs):
+    if review_signals_suspended():
+        return
+    if created:
+        invalidate_count_on_commit(Review, title_id=instance.title_id)
+
+
+@receiver(post_delete, sender=Review)
+def invalidate_review_count_on_delete(sender, instance, **kwargs):
+    if review_signals_suspended():
+        return
+    invalidate_count_on_commit(Review, title_id=instance.title_id)
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_cached_user(sender, instance, **kwargs):
+    user_cache.invalidate(str(instance.pk))
+    invalidate_token_version(instance.pk)
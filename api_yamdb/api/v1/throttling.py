@@ -0,0 +1,95 @@
+import time
+from collections.abc import Mapping
+from hashlib import md5
+
+from django.core.cache import caches
+from rest_framework.throttling import BaseThrottle
+
+from api_yamdb.settings import AUTH_THROTTLE_RATES
+
+THROTTLE_CACHE_ALIAS = 'throttle'
+PERIODS = {'s': 1, 'm': 60, 'h': 60 * 60, 'd': 24 * 60 * 60}
+
+
+def parse_rate(rate):
+    """Ёмкость и скорость пополнения корзины из строки вида '10/min'."""
+    count, period = rate.split('/')
+    capacity = int(count)
+    return capacity, capacity / PERIODS[period[0]]
+
+
+class TokenBucketThrottle(BaseThrottle):
+    """Ограничение частоты запросов по алгоритму «корзины маркеров».
+
+    У каждого ключа своя корзина на AUTH_THROTTLE_RATES[<scope>] маркеров,
+    которая равномерно пополняется за период; запрос тратит один маркер
+    из каждой своей корзины. Состояние хранится в кэше 'throttle',
+    общем для процессов одной машины. Обновление корзины не атомарно,
+    поэтому при одновременных запросах лимит может быть превышен
+    на единицы запросов.
+
+    По умолчанию корзина одна на IP-адрес клиента. Адрес берётся
+    с учётом REST_FRAMEWORK['NUM_PROXIES']: без доверенных прокси
+    заголовок X-Forwarded-For игнорируется.
+    """
+    scope_suffix = 'ip'
+
+    def __init__(self, cache=None):
+        self.cache = cache or caches[THROTTLE_CACHE_ALIAS]
+
+    def get_scope(self, view):
+        return f'{view.throttle_scope}_{self.scope_suffix}'
+
+    def get_idents(self, request, view):
+        return [self.get_ident(request)]
+
+    def allow_request(self, request, view):
+        scope = self.get_scope(view)
+        rate = AUTH_THROTTLE_RATES.get(scope)
+        if rate is None:
+            return True
+        capacity, refill = parse_rate(rate)
+        keys = [
+            f'throttle:{scope}:{md5(ident.encode("utf-8")).hexdigest()}'
+            for ident in self.get_idents(request, view)
+        ]
+        buckets = self.cache.get_many(keys)
+        now = time.time()
+        updated = {}
+        self.delay = 0
+        for key in keys:
+            tokens, updated_at = buckets.get(key, (capacity, now))
+            tokens = min(capacity, tokens + (now - updated_at) * refill)
+            if tokens < 1:
+                self.delay = max(self.delay, (1 - tokens) / refill)
+            updated[key] = (tokens - 1, now)
+        if self.delay:
+            return False
+        self.cache.set_many(updated, int(capacity / refill) + 1)
+        return True
+
+    def wait(self):
+        return self.delay
+
+
+class IPThrottle(TokenBucketThrottle):
+    """Корзина на IP-адрес клиента: <scope>_ip."""
+
+
+class IdentityThrottle(TokenBucketThrottle):
+    """Корзины на значения полей запроса из view.throttle_identity_fields,
+    например username и email: <scope>_identity.
+
+    Если тело запроса не объект, корзина берётся по IP-адресу.
+    """
+    scope_suffix = 'identity'
+
+    def get_idents(self, request, view):
+        if not isinstance(request.data, Mapping):
+            return super().get_idents(request, view)
+        idents = []
+        for field in view.throttle_identity_fields:
+            value = request.data.get(field)
+            if isinstance(value, str) and value.strip():
+                idents.append(f'{field}:{value.strip().lower()}')
+        return idents
@@ -2,8 +2,9 @@ from django.urls import include, path
 from rest_framework.routers import DefaultRouter
 
 from .views import (
-    CategoryViewSet, CommentViewSet, GenreViewSet, ReviewViewSet,
-    SignUpView, TitleViewSet, TokenView, UserViewSet,
+    BulkReviewView, CategoryViewSet, CommentViewSet, GenreViewSet,
+    ModerationView, ReviewExportView, ReviewViewSet, SignUpView,
+    TitleViewSet, TokenView, UserViewSet,
 )
 
 app_name = 'api'
@@ -23,6 +24,11 @@ router_v1.register(
 )
 
 urlpatterns = [
+    path('reviews/bulk/', BulkReviewView.as_view(), name='reviews-bulk'),
+    path(
+        'reviews/export/', ReviewExportView.as_view(), name='reviews-export'
+    ),
+    path('moderation/', ModerationView.as_view(), name='moderation'),
     path('', include(router_v1.urls)),
     path('auth/signup/', SignUpView.as_view(), name='signup'),
     path('auth/token/', TokenView.as_view(), name='token')
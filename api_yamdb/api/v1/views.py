@@ -1,32 +1,71 @@
+from collections import Counter
+
 from django.contrib.auth.tokens import default_token_generator
-from django.core.mail import send_mail
-from django.db.models import Avg
+from django.db import IntegrityError, transaction
+from django.db.models import OuterRef, Prefetch, Q, Subquery
+from django.http import Http404
 from django_filters.rest_framework import DjangoFilterBackend
 from django.shortcuts import get_object_or_404
 from rest_framework import filters, mixins, permissions, status, viewsets
-from rest_framework_simplejwt.tokens import AccessToken
 from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
 from rest_framework.pagination import PageNumberPagination
+from rest_framework.parsers import JSONParser
 from rest_framework.response import Response
+from rest_framework.settings import api_settings
 from rest_framework.views import APIView
 
 from api_yamdb import settings
-from reviews.models import Category, Genre, Review, Title
+from reviews.models import Category, Comment, Genre, Review, Title
+from reviews.ratings import (
+    change_score_counts, change_title_rating, get_score_histogram
+)
 from users.models import User
-from .filters import TitleFilter
+from users.outbox import enqueue_email, enqueue_emails
+from .authentication import (
+    RoleAccessToken, get_author_fields, get_request_user
+)
+from .cache import bump_version, invalidate_count
+from .export import stream_reviews
+from .filters import TitleFilter, TitleOrderingFilter, TitleSearchFilter
+from .mixins import (
+    CachedListMixin, CachedResponseMixin, ConditionalGetMixin,
+    ConditionalListMixin, NestedParentMixin
+)
+from .moderation import moderate
+from .pagination import (
+    CachedCountPagination, PubDatePagination, TitlePagination
+)
+from .parsers import CSVParser
 from .permissions import (
     IsAdminOrReadOnly,
     IsAuthorAdminSuperuserOrReadOnlyPermission,
-    IsAdminPermission
+    IsAdminPermission,
+    IsModeratorAdminPermission
 )
 from .serializers import (
-    CategorySerializer, CommentSerializer, CustomUserSerializer,
-    GenreSerializer, ReviewSerializer, SignUpSerializer,
-    TitleReadSerializer, TitlePostSerializer, TokenSerializer
+    BulkReviewSerializer, BulkUserSerializer, CategorySerializer,
+    CommentSerializer, CustomUserSerializer, GenreSerializer,
+    ModerationSerializer, ReviewSerializer, ReviewWithCommentsSerializer,
+    SignUpSerializer, TitleReadSerializer, TitlePostSerializer,
+    TokenSerializer
 )
+from .throttling import IdentityThrottle, IPThrottle
+
+
+def get_confirmation_email(user):
+    """Тема, текст и получатель письма с кодом подтверждения."""
+    confirmation_code = default_token_generator.make_token(user)
+    return (
+        'Проверочный код',
+        f'Проверочный код: {confirmation_code}',
+        user.email,
+    )
 
 
 class CreateListDestroyViewSet(
+    ConditionalListMixin,
+    CachedListMixin,
     mixins.CreateModelMixin,
     mixins.DestroyModelMixin,
     mixins.ListModelMixin,
@@ -42,32 +81,83 @@ class CreateListDestroyViewSet(
 class CategoryViewSet(CreateListDestroyViewSet):
     queryset = Category.objects.all()
     serializer_class = CategorySerializer
+    cache_namespaces = ('categories',)
 
 
 class GenreViewSet(CreateListDestroyViewSet):
     queryset = Genre.objects.all()
     serializer_class = GenreSerializer
+    cache_namespaces = ('genres',)
 
 
-class TitleViewSet(viewsets.ModelViewSet):
-    queryset = Title.objects.all().annotate(
-        rating=Avg('reviews__score')
-    ).order_by('name')
+class TitleViewSet(
+    ConditionalGetMixin, CachedResponseMixin, viewsets.ModelViewSet
+):
+    queryset = Title.objects.select_related(
+        'category'
+    ).prefetch_related('genre').order_by('name')
     permission_classes = (IsAdminOrReadOnly,)
-    filter_backends = (DjangoFilterBackend,)
+    filter_backends = (
+        DjangoFilterBackend, TitleSearchFilter, TitleOrderingFilter
+    )
     filterset_class = TitleFilter
-    pagination_class = PageNumberPagination
+    pagination_class = TitlePagination
     http_method_names = ['get', 'post', 'patch', 'delete']
+    cache_namespaces = ('titles',)
 
     def get_serializer_class(self):
         if self.action in ('list', 'retrieve'):
             return TitleReadSerializer
         return TitlePostSerializer
 
+    def get_count_scope(self):
+        return {}
+
+    def get_score_histogram(self, request, pk):
+        histogram = get_score_histogram(pk)
+        if not histogram['count'] and not Title.objects.filter(
+            pk=pk
+        ).exists():
+            raise Http404
+        return Response(histogram)
+
+    @action(methods=['get'], detail=True, url_path='score-histogram')
+    def score_histogram(self, request, pk=None):
+        """Количество отзывов с каждой оценкой, их общее число и среднее.
+
+        Читается из счётчиков оценок произведения одним запросом.
+        """
+        return self.get_conditional_response(
+            self.get_score_histogram, request, pk=pk
+        )
+
 
 class SignUpView(APIView):
     """Регистрация новых пользователей через почту.
     Возможность повторного запроса кода подтверждения."""
+    throttle_classes = (IPThrottle, IdentityThrottle)
+    throttle_scope = 'signup'
+    throttle_identity_fields = ('username', 'email')
+
+    @staticmethod
+    def get_user(username, email):
+        """Пользователь с этими username и email или ошибки занятости.
+
+        Все пользователи с таким username или email выбираются одним
+        запросом по уникальным индексам, случаи разбираются в памяти.
+        """
+        users = User.objects.filter(Q(username=username) | Q(email=email))
+        errors = {}
+        for user in users:
+            if user.username == username and user.email == email:
+                return user, {}
+            if user.username == username:
+                errors['username'] = ['Username уже занят.']
+            else:
+                errors['email'] = ['Email уже занят.']
+        if 'username' in errors:
+            return None, {'username': errors['username']}
+        return None, errors
 
     def post(self, request):
         """Post-запрос пользователя на получение кода подтверждения."""
@@ -75,33 +165,25 @@ class SignUpView(APIView):
         serializer.is_valid(raise_exception=True)
         username = serializer.validated_data.get('username')
         email = serializer.validated_data.get('email')
-        response_data = {}
-        if not User.objects.filter(username=username, email=email).exists():
-            if User.objects.filter(username=username).exists():
-                response_data['username'] = ['Username уже занят.']
-                return Response(
-                    response_data, status=status.HTTP_400_BAD_REQUEST
-                )
-            if User.objects.filter(email=email).exists():
-                response_data['email'] = ['Email уже занят.']
-                return Response(
-                    response_data, status=status.HTTP_400_BAD_REQUEST
-                )
-        user, _ = User.objects.get_or_create(
-            **serializer.validated_data
-        )
-        confirmation_code = default_token_generator.make_token(user)
-        send_mail(
-            subject='Проверочный код',
-            message=f'Проверочный код: {confirmation_code}',
-            from_email=settings.EMAIL,
-            recipient_list=(user.email,),
-            fail_silently=False
-        )
+        user, response_data = self.get_user(username, email)
+        if user is None and not response_data:
+            try:
+                with transaction.atomic():
+                    user = User.objects.create(
+                        username=username, email=email
+                    )
+            except IntegrityError:
+                # Пользователь зарегистрировался параллельным запросом.
+                user, response_data = self.get_user(username, email)
+        if user is None:
+            return Response(
+                response_data, status=status.HTTP_400_BAD_REQUEST
+            )
+        enqueue_email(*get_confirmation_email(user))
         return Response(serializer.data, status=status.HTTP_200_OK)
 
 
-class UserViewSet(viewsets.ModelViewSet):
+class UserViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     """Запросы к пользователю.
 
     Регистрация администратором нового пользователя через post.
@@ -113,7 +195,136 @@ class UserViewSet(viewsets.ModelViewSet):
     filter_backends = (filters.SearchFilter,)
     lookup_field = 'username'
     search_fields = ('username',)
-    pagination_class = PageNumberPagination
+    pagination_class = CachedCountPagination
+    cache_namespaces = ('users',)
+
+    def get_count_scope(self):
+        return {}
+
+    @staticmethod
+    def chunks(items):
+        size = settings.BULK_USERS_CHUNK_SIZE
+        for start in range(0, len(items), size):
+            yield items[start:start + size]
+
+    def validate_rows(self, rows):
+        """Возвращает новых пользователей и ошибки по индексам строк.
+
+        Занятые username и email ищутся запросами на пачку строк,
+        повторы внутри запроса — в памяти.
+        """
+        errors = {}
+        valid = {}
+        for idx, row in enumerate(rows):
+            serializer = BulkUserSerializer(data=row)
+            if serializer.is_valid():
+                valid[idx] = serializer.validated_data
+            else:
+                errors[idx] = serializer.errors
+        taken_usernames = set()
+        taken_emails = set()
+        for chunk in self.chunks(list(valid.values())):
+            for username, email in User.objects.filter(
+                Q(username__in=[data['username'] for data in chunk])
+                | Q(email__in=[data['email'] for data in chunk])
+            ).values_list('username', 'email'):
+                taken_usernames.add(username)
+                taken_emails.add(email)
+        users = []
+        for idx, data in valid.items():
+            row_errors = {}
+            if data['username'] in taken_usernames:
+                row_errors['username'] = ['Username уже занят.']
+            if data['email'] in taken_emails:
+                row_errors['email'] = ['Email уже занят.']
+            if row_errors:
+                errors[idx] = row_errors
+                continue
+            taken_usernames.add(data['username'])
+            taken_emails.add(data['email'])
+            user = User(**data)
+            user.set_unusable_password()
+            users.append(user)
+        return users, errors
+
+    def create_users(self, users, send_emails):
+        """Сохраняет пользователей пачками и ставит письма в очередь
+        одной транзакцией.
+
+        bulk_create не отправляет сигналы post_save, поэтому кэш списка
+        и количества пользователей сбрасывается здесь.
+        """
+        with transaction.atomic():
+            User.objects.bulk_create(
+                users, batch_size=settings.BULK_USERS_CHUNK_SIZE
+            )
+            if send_emails:
+                # Код подтверждения строится по id, которые bulk_create
+                # возвращает не во всех СУБД, поэтому пользователи
+                # перечитываются пачками.
+                for chunk in self.chunks(users):
+                    created = User.objects.filter(
+                        username__in=[user.username for user in chunk]
+                    )
+                    enqueue_emails(
+                        [get_confirmation_email(user) for user in created]
+                    )
+        bump_version('users')
+        invalidate_count(User)
+
+    @action(
+        methods=['post'], detail=False, url_path='bulk',
+        parser_classes=(JSONParser, CSVParser)
+    )
+    def bulk(self, request):
+        """Массовый импорт пользователей из JSON-массива или CSV.
+
+        Права доступа: администратор. Эндпоинт: users/bulk/.
+        С параметром send_emails=true новым пользователям ставятся
+        в очередь письма с кодом подтверждения.
+        """
+        rows = request.data
+        if not isinstance(rows, list) or not rows:
+            raise ValidationError({
+                api_settings.NON_FIELD_ERRORS_KEY: [
+                    'Ожидается непустой список пользователей.'
+                ]
+            })
+        if len(rows) > settings.BULK_USERS_MAX_SIZE:
+            raise ValidationError({
+                api_settings.NON_FIELD_ERRORS_KEY: [
+                    'Можно загрузить не более '
+                    f'{settings.BULK_USERS_MAX_SIZE} пользователей за раз.'
+                ]
+            })
+        users, errors = self.validate_rows(rows)
+        if users:
+            try:
+                self.create_users(
+                    users,
+                    request.query_params.get('send_emails') in (
+                        'true', '1'
+                    ),
+                )
+            except IntegrityError:
+                return Response(
+                    {'detail': 'Пользователи изменились во время загрузки, '
+                               'повторите запрос.'},
+                    status=status.HTTP_409_CONFLICT
+                )
+        return Response(
+            {
+                'created': len(users),
+                'errors': [
+                    {'index': idx, 'errors': errors[idx]}
+                    for idx in sorted(errors)
+                ],
+            },
+            status=(
+                status.HTTP_201_CREATED if users
+                else status.HTTP_400_BAD_REQUEST
+            )
+        )
 
     @action(
         methods=['get', 'patch'], detail=False,
@@ -124,19 +335,23 @@ class UserViewSet(viewsets.ModelViewSet):
 
         Права доступа: Любой авторизованный пользователь. Эндпоинт: users/me/.
         """
+        user = get_request_user(request.user)
         if request.method == 'PATCH':
             serializer = CustomUserSerializer(
-                request.user, data=request.data, partial=True
+                user, data=request.data, partial=True
             )
             serializer.is_valid(raise_exception=True)
-            serializer.save(role=request.user.role)
+            serializer.save(role=user.role)
             return Response(serializer.data, status=status.HTTP_200_OK)
-        serializer = CustomUserSerializer(request.user)
+        serializer = CustomUserSerializer(user)
         return Response(serializer.data, status=status.HTTP_200_OK)
 
 
 class TokenView(APIView):
     """Получение токена."""
+    throttle_classes = (IPThrottle, IdentityThrottle)
+    throttle_scope = 'token'
+    throttle_identity_fields = ('username',)
 
     def post(self, request):
         serializer = TokenSerializer(data=request.data)
@@ -145,47 +360,282 @@ class TokenView(APIView):
         confirmation_code = serializer.validated_data['confirmation_code']
         user = get_object_or_404(User, username=username)
         if default_token_generator.check_token(user, confirmation_code):
-            token = AccessToken.for_user(user)
+            token = RoleAccessToken.for_user(user)
             return Response({'token': str(token)}, status=status.HTTP_200_OK)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
-class ReviewViewSet(viewsets.ModelViewSet):
+class ReviewViewSet(
+    ConditionalGetMixin, NestedParentMixin, viewsets.ModelViewSet
+):
     serializer_class = ReviewSerializer
     permission_classes = (
         IsAuthorAdminSuperuserOrReadOnlyPermission,
     )
-    pagination_class = PageNumberPagination
+    pagination_class = PubDatePagination
     http_method_names = ['get', 'post', 'patch', 'delete']
+    parent_model = Title
+    parent_lookup_kwargs = {'id': 'title_id'}
 
     def get_title(self):
-        title_id = self.kwargs.get('title_id')
-        return get_object_or_404(Title, id=title_id)
+        return self.get_parent_object()
 
     def perform_create(self, serializer):
-        serializer.save(author=self.request.user, title=self.get_title())
+        try:
+            serializer.save(
+                title_id=self.kwargs.get('title_id'),
+                **get_author_fields(self.request.user)
+            )
+        except Title.DoesNotExist:
+            raise Http404
+
+    def is_expanded(self):
+        expand = self.request.query_params.get('expand', '')
+        return (
+            self.request.method in permissions.SAFE_METHODS
+            and 'comments' in expand.split(',')
+        )
+
+    def get_comments_limit(self):
+        limit = self.request.query_params.get(
+            'comments_limit', settings.EXPANDED_COMMENTS_LIMIT
+        )
+        try:
+            limit = int(limit)
+        except (TypeError, ValueError):
+            limit = 0
+        if limit < 1:
+            raise ValidationError(
+                {'comments_limit': ['Ожидается целое положительное число.']}
+            )
+        return min(limit, settings.EXPANDED_COMMENTS_MAX_LIMIT)
+
+    def get_latest_comments(self):
+        """Последние комментарии всех отзывов страницы одним запросом.
+
+        Для каждого отзыва коррелированный подзапрос выбирает id его
+        последних комментариев по индексу (review, -pub_date, id).
+        """
+        latest = Comment.objects.filter(
+            review_id=OuterRef('review_id')
+        ).order_by('-pub_date', 'id').values('id')[:self.get_comments_limit()]
+        return Prefetch(
+            'comments',
+            queryset=Comment.objects.select_related('author').filter(
+                id__in=Subquery(latest)
+            ).order_by('-pub_date', 'id'),
+            to_attr='latest_comments',
+        )
+
+    def get_serializer_class(self):
+        if self.is_expanded():
+            return ReviewWithCommentsSerializer
+        return ReviewSerializer
 
     def get_queryset(self):
-        title = self.get_title()
-        return title.reviews.all()
+        queryset = Review.objects.select_related('author').filter(
+            title_id=self.kwargs.get('title_id')
+        )
+        if self.is_expanded():
+            queryset = queryset.prefetch_related(self.get_latest_comments())
+        return queryset
+
+    def get_count_scope(self):
+        return {'title_id': self.kwargs.get('title_id')}
 
+    @action(
+        methods=['get'], detail=False,
+        permission_classes=(IsAdminPermission,)
+    )
+    def export(self, request, title_id=None):
+        """Потоковая выгрузка всех отзывов произведения в NDJSON."""
+        self.get_title()
+        return stream_reviews(
+            request, Review.objects.filter(title_id=title_id)
+        )
 
-class CommentViewSet(viewsets.ModelViewSet):
+    def get_cache_namespaces(self):
+        title_id = self.kwargs.get('title_id')
+        if self.is_expanded():
+            return (f'reviews:title:{title_id}', f'comments:title:{title_id}')
+        return (f'reviews:title:{title_id}',)
+
+
+class BulkReviewView(APIView):
+    """Массовая загрузка отзывов текущего пользователя на разные
+    произведения.
+
+    Проверки выполняются для всей пачки сразу: одним запросом
+    существующие произведения, одним — уже оставленные отзывы.
+    Корректные отзывы сохраняются одним bulk_create, рейтинг каждого
+    затронутого произведения обновляется один раз. Ошибки возвращаются
+    по индексам отзывов в запросе.
+    """
+    permission_classes = (permissions.IsAuthenticated,)
+
+    def get_items(self, request):
+        items = request.data
+        if not isinstance(items, list) or not items:
+            raise ValidationError({
+                api_settings.NON_FIELD_ERRORS_KEY: [
+                    'Ожидается непустой список отзывов.'
+                ]
+            })
+        if len(items) > settings.BULK_REVIEWS_MAX_SIZE:
+            raise ValidationError({
+                api_settings.NON_FIELD_ERRORS_KEY: [
+                    'Можно загрузить не более '
+                    f'{settings.BULK_REVIEWS_MAX_SIZE} отзывов за раз.'
+                ]
+            })
+        return items
+
+    def validate_items(self, items, author_id):
+        """Возвращает корректные отзывы и ошибки по индексам."""
+        errors = {}
+        valid = {}
+        for idx, item in enumerate(items):
+            serializer = BulkReviewSerializer(data=item)
+            if serializer.is_valid():
+                valid[idx] = serializer.validated_data
+            else:
+                errors[idx] = serializer.errors
+        title_ids = {data['title_id'] for data in valid.values()}
+        existing_titles = set(Title.objects.filter(
+            id__in=title_ids
+        ).values_list('id', flat=True))
+        reviewed_titles = set(Review.objects.filter(
+            author_id=author_id, title_id__in=existing_titles
+        ).values_list('title_id', flat=True))
+        reviews = []
+        for idx, data in valid.items():
+            title_id = data['title_id']
+            if title_id not in existing_titles:
+                errors[idx] = {'title': ['Произведение не найдено.']}
+            elif title_id in reviewed_titles:
+                errors[idx] = {api_settings.NON_FIELD_ERRORS_KEY: [
+                    'Можно создать только 1 отзыв на 1 произведение'
+                ]}
+            else:
+                reviewed_titles.add(title_id)
+                reviews.append(Review(author_id=author_id, **data))
+        return reviews, errors
+
+    def create_reviews(self, reviews):
+        """Сохраняет отзывы и рейтинги одной транзакцией.
+
+        bulk_create не отправляет сигналы post_save, поэтому рейтинги,
+        счётчики оценок, версии кэша и количества обновляются здесь.
+        """
+        deltas = {}
+        score_counts = Counter()
+        for review in reviews:
+            score, count = deltas.get(review.title_id, (0, 0))
+            deltas[review.title_id] = (score + review.score, count + 1)
+            score_counts[review.title_id, review.score] += 1
+        with transaction.atomic():
+            Review.objects.bulk_create(reviews)
+            for title_id, (score_delta, count_delta) in deltas.items():
+                change_title_rating(title_id, score_delta, count_delta)
+            change_score_counts(score_counts)
+        bump_version(
+            'titles', *(f'reviews:title:{title_id}' for title_id in deltas)
+        )
+        for title_id in deltas:
+            invalidate_count(Review, title_id=title_id)
+        return Review.objects.select_related('author').filter(
+            author_id=reviews[0].author_id, title_id__in=deltas
+        ).order_by('id')
+
+    def post(self, request):
+        items = self.get_items(request)
+        reviews, errors = self.validate_items(items, request.user.id)
+        created = []
+        if reviews:
+            try:
+                created = self.create_reviews(reviews)
+            except IntegrityError:
+                return Response(
+                    {'detail': 'Отзывы изменились во время загрузки, '
+                               'повторите запрос.'},
+                    status=status.HTTP_409_CONFLICT
+                )
+        return Response(
+            {
+                'created': BulkReviewSerializer(created, many=True).data,
+                'errors': [
+                    {'index': idx, 'errors': errors[idx]}
+                    for idx in sorted(errors)
+                ],
+            },
+            status=(
+                status.HTTP_201_CREATED if created
+                else status.HTTP_400_BAD_REQUEST
+            )
+        )
+
+
+class ReviewExportView(APIView):
+    """Потоковая выгрузка всех отзывов сайта в NDJSON."""
+    permission_classes = (IsAdminPermission,)
+
+    def get(self, request):
+        return stream_reviews(request, Review.objects.all())
+
+
+class ModerationView(APIView):
+    """Массовое удаление или замена текста отзывов и комментариев
+    по списку id и/или автору.
+
+    Права доступа: модератор или администратор.
+    """
+    permission_classes = (IsModeratorAdminPermission,)
+
+    def post(self, request):
+        serializer = ModerationSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        return Response(
+            moderate(**serializer.validated_data), status=status.HTTP_200_OK
+        )
+
+
+class CommentViewSet(
+    ConditionalGetMixin, NestedParentMixin, viewsets.ModelViewSet
+):
     serializer_class = CommentSerializer
     permission_classes = (
         IsAuthorAdminSuperuserOrReadOnlyPermission,
     )
-    pagination_class = PageNumberPagination
+    pagination_class = PubDatePagination
     http_method_names = ['get', 'post', 'patch', 'delete']
+    parent_model = Review
+    parent_lookup_kwargs = {'id': 'review_id', 'title_id': 'title_id'}
 
     def get_review(self):
-        review_id = self.kwargs.get('review_id')
-        title_id = self.kwargs.get('title_id')
-        return get_object_or_404(Review, id=review_id, title__id=title_id)
+        return self.get_parent_object()
 
     def perform_create(self, serializer):
-        serializer.save(author=self.request.user, review=self.get_review())
+        serializer.save(
+            review=self.get_review(), **get_author_fields(self.request.user)
+        )
 
     def get_queryset(self):
-        review = self.get_review()
-        return review.comments.all()
+        return Comment.objects.select_related('author').filter(
+            review_id=self.kwargs.get('review_id'),
+            review__title_id=self.kwargs.get('title_id'),
+        )
+
+    def get_count_scope(self):
+        return {
+            'review_id': self.kwargs.get('review_id'),
+            'title_id': self.kwargs.get('title_id'),
+        }
+
+    def get_cache_namespaces(self):
+        # Список комментариев зависит и от существования отзыва: при
+        # массовом удалении отзывов сбрасывается только версия отзывов
+        # произведения.
+        return (
+            f'comments:review:{self.kwargs.get("review_id")}',
+            f'reviews:title:{self.kwargs.get("title_id")}',
+        )
@@ -1,4 +1,5 @@
 import os
+import tempfile
 
 
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -119,19 +120,115 @@ REST_FRAMEWORK = {
         'rest_framework.permissions.AllowAny',
     ],
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'api.v1.authentication.CachedJWTAuthentication',
     ],
     'PAGE_SIZE': 10,
+    # Количество доверенных прокси перед приложением: IP-адрес клиента
+    # для ограничения частоты запросов берётся из X-Forwarded-For только
+    # за ними. 0 - заголовок не учитывается, используется REMOTE_ADDR.
+    'NUM_PROXIES': 0,
 }
 
 AUTH_USER_MODEL = 'users.User'
 
+# Кэш пользователей JWT-аутентификации в памяти процесса: количество
+# записей и срок жизни записи в секундах.
+
+AUTH_USER_CACHE_SIZE = 1024
+AUTH_USER_CACHE_TTL = 60
+
+# Кэш. LocMemCache работает в пределах одного процесса: при запуске
+# нескольких процессов (gunicorn) используйте общий бэкенд, например
+# django.core.cache.backends.filebased.FileBasedCache.
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    # Корзины ограничения частоты запросов: общие для всех процессов
+    # на машине, поэтому хранятся в файлах.
+    'throttle': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': os.path.join(tempfile.gettempdir(), 'api_yamdb_throttle'),
+        'OPTIONS': {'MAX_ENTRIES': 10000},
+    },
+    # Версии токенов пользователей: отзыв токенов сразу виден всем
+    # процессам на машине.
+    'tokens': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': os.path.join(tempfile.gettempdir(), 'api_yamdb_tokens'),
+        'OPTIONS': {'MAX_ENTRIES': 10000},
+    },
+}
+
+# Кэширование ответов на чтение произведений, жанров и категорий:
+
+RESPONSE_CACHE_TIMEOUT = 60 * 60
+
+# Кэширование количества объектов в пагинации:
+
+COUNT_CACHE_TIMEOUT = 60 * 60
+# Нефильтрованные списки, в которых по статистике БД больше строк,
+# отдают оценку количества вместо точного COUNT(*). None - отключено.
+APPROXIMATE_COUNT_THRESHOLD = None
+
+# Наибольшее количество отзывов в одном запросе массовой загрузки:
+
+BULK_REVIEWS_MAX_SIZE = 100
+
+# Последние комментарии в отзывах при ?expand=comments:
+
+EXPANDED_COMMENTS_LIMIT = 3
+EXPANDED_COMMENTS_MAX_LIMIT = 20
+
+# Размер пачки отзывов при потоковой выгрузке NDJSON:
+
+EXPORT_CHUNK_SIZE = 500
+
+# Наибольшее количество id в одном запросе массовой модерации:
+
+MODERATION_MAX_IDS = 1000
+
+# Размер пачки произведений при пересчёте рейтингов после массовой
+# модерации:
+
+MODERATION_CHUNK_SIZE = 500
+
+# Массовый импорт пользователей: наибольшее количество строк в запросе
+# и размер пачки проверок и вставки.
+
+BULK_USERS_MAX_SIZE = 50000
+BULK_USERS_CHUNK_SIZE = 500
+
+# Ограничение частоты запросов регистрации и получения токена: корзина
+# на IP-адрес и на каждое значение username/email. '10/min' - 10 запросов
+# подряд, затем по одному каждые 6 секунд.
+
+AUTH_THROTTLE_RATES = {
+    'signup_ip': '10/min',
+    'signup_identity': '3/min',
+    'token_ip': '30/min',
+    'token_identity': '10/min',
+}
+
 # Настройка почты:
 
 EMAIL = 'example@mail.ru'
 EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
 EMAIL_FILE_PATH = os.path.join(BASE_DIR, 'sent_emails')
 
+# Очередь писем, отправляемых командой send_outbox:
+
+OUTBOX_BATCH_SIZE = 100
+OUTBOX_MAX_ATTEMPTS = 5
+# Задержка перед повторной попыткой удваивается с каждой неудачей.
+OUTBOX_RETRY_DELAY = 60
+OUTBOX_MAX_RETRY_DELAY = 60 * 60
+OUTBOX_POLL_INTERVAL = 5
+# Срок, на который обработчик забирает пачку писем. Если он не отметил
+# результат за это время, письма снова становятся доступны для отправки.
+OUTBOX_LEASE_TIMEOUT = 5 * 60
+
 # Переменные импортируемые в модель User и serializers.py:
 
 MAX_LENGTH_EMAIL = 254
@@ -140,6 +237,7 @@ MAX_LENGTH_CONFIRMATION_CODE = 150
 MAX_LENGTH_FIRST_NAME = 150
 MAX_LENGTH_LAST_NAME = 150
 MAX_LENGTH_ROLE = 150
+MAX_LENGTH_SUBJECT = 255
 
 MAX_LENGTH = 256
 
@@ -0,0 +1,99 @@
+import re
+import time
+
+from django.core.management import BaseCommand
+from django.db.models import Count
+from rest_framework.test import APIRequestFactory
+
+from api.v1.views import CommentViewSet, ReviewViewSet
+from api_yamdb.settings import REST_FRAMEWORK
+from reviews.models import Comment, Review, Title
+
+SORT_STEP = re.compile(r'TEMP B-TREE FOR (?:RIGHT PART OF )?ORDER BY|Sort')
+
+
+def get_view_queryset(viewset, **kwargs):
+    """Запрос списка, построенный самим представлением API."""
+    view = viewset(
+        action_map={'get': 'list'}, args=(), kwargs=kwargs, format_kwarg=None
+    )
+    view.request = view.initialize_request(APIRequestFactory().get('/'))
+    return view.filter_queryset(view.get_queryset())
+
+
+def get_nested_list_querysets():
+    """Запросы страниц отзывов и комментариев в том виде, как их строит API.
+
+    Берутся произведение с наибольшим числом отзывов и отзыв с наибольшим
+    числом комментариев; запросы списков строят ReviewViewSet и
+    CommentViewSet, курсорный порядок — их пагинация.
+    """
+    title = Title.objects.annotate(
+        total=Count('reviews')
+    ).order_by('-total').first()
+    review = Review.objects.annotate(
+        total=Count('comments')
+    ).order_by('-total').first()
+    title_id = title.id if title else 0
+    page_size = REST_FRAMEWORK['PAGE_SIZE']
+    reviews = get_view_queryset(ReviewViewSet, title_id=title_id)
+    comments = get_view_queryset(
+        CommentViewSet,
+        title_id=review.title_id if review else 0,
+        review_id=review.id if review else 0,
+    )
+    return {
+        'reviews': reviews[:page_size],
+        'reviews (cursor)': reviews.order_by(
+            *ReviewViewSet.pagination_class.keyset_ordering
+        )[:page_size + 1],
+        'comments': comments[:page_size],
+        'comments (cursor)': comments.order_by(
+            *CommentViewSet.pagination_class.keyset_ordering
+        )[:page_size + 1],
+        'reviews by author': Review.objects.filter(
+            author_id=0
+        ).order_by('-pub_date')[:page_size],
+        'comments by author': Comment.objects.filter(
+            author_id=0
+        ).order_by('-pub_date')[:page_size],
+    }
+
+
+def has_sort_step(plan):
+    """Есть ли в плане запроса отдельная сортировка строк."""
+    return bool(SORT_STEP.search(plan))
+
+
+class Command(BaseCommand):
+    help = (
+        'Показывает планы и время запросов страниц отзывов и комментариев '
+        'и проверяет, что они читаются в порядке индекса без сортировки.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--repeat', type=int, default=100,
+            help='Сколько раз выполнить каждый запрос для замера времени.'
+        )
+
+    def handle(self, *args, **options):
+        repeat = max(options['repeat'], 1)
+        sorted_queries = 0
+        for name, queryset in get_nested_list_querysets().items():
+            plan = queryset.explain()
+            started = time.perf_counter()
+            for _ in range(repeat):
+                list(queryset.all())
+            elapsed = (time.perf_counter() - started) / repeat * 1000
+            sort = has_sort_step(plan)
+            sorted_queries += sort
+            self.stdout.write(
+                f'{name}: {elapsed:.3f} мс, '
+                f'{"есть сортировка" if sort else "порядок индекса"}'
+            )
+            self.stdout.write(plan)
+        if sorted_queries:
+            self.stderr.write(
+                f'Запросов с отдельной сортировкой: {sorted_queries}'
+            )
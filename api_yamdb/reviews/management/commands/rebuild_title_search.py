@@ -0,0 +1,20 @@
+from django.core.management import BaseCommand
+from django.db import connection
+
+from reviews.search import install_title_search, is_title_search_supported
+
+
+class Command(BaseCommand):
+    help = (
+        'Восстанавливает полнотекстовый индекс произведений '
+        'и триггеры его синхронизации.'
+    )
+
+    def handle(self, *args, **options):
+        if not is_title_search_supported(connection):
+            self.stdout.write(
+                'Полнотекстовый индекс доступен только в SQLite.'
+            )
+            return
+        install_title_search(connection)
+        self.stdout.write('Полнотекстовый индекс произведений перестроен.')
@@ -0,0 +1,18 @@
+from django.core.management import BaseCommand
+
+from reviews.ratings import (
+    recalculate_score_counts, recalculate_title_ratings
+)
+
+
+class Command(BaseCommand):
+    help = (
+        'Пересчитывает сохранённый рейтинг и счётчики оценок '
+        'всех произведений.'
+    )
+
+    def handle(self, *args, **options):
+        updated = recalculate_title_ratings()
+        self.stdout.write(f'Пересчитан рейтинг произведений: {updated}')
+        created = recalculate_score_counts()
+        self.stdout.write(f'Пересобрано счётчиков оценок: {created}')
@@ -0,0 +1,17 @@
+# Generated by Django 3.2 on 2026-10-18 18:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0004_genretitle_genre_title_idx'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='title',
+            index=models.Index(fields=['rating'], name='title_rating_idx'),
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 3.2 on 2026-10-18 18:28
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0006_review_comment_pub_date_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TitleScoreCount',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('score', models.PositiveSmallIntegerField(verbose_name='Оценка')),
+                ('count', models.PositiveIntegerField(default=0, verbose_name='Количество отзывов')),
+                ('title', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='score_counts', to='reviews.title', verbose_name='Произведение')),
+            ],
+            options={
+                'verbose_name': 'Количество оценок',
+                'verbose_name_plural': 'Количество оценок',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='titlescorecount',
+            constraint=models.UniqueConstraint(fields=('title', 'score'), name='unique_title_score'),
+        ),
+    ]
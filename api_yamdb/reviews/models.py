@@ -1,7 +1,7 @@
 from django.core.validators import (
     MaxValueValidator, MinValueValidator,
 )
-from django.db import models
+from django.db import models, transaction
 
 from api.v1.validators import validate_date
 from api_yamdb.settings import MAX_LENGTH, MIN_SCORE, MAX_SCORE
@@ -43,6 +43,9 @@ class Genre(models.Model):
         return self.name
 
 
+RATING_FIELDS = ('rating_sum', 'rating_count', 'rating')
+
+
 class Title(models.Model):
     name = models.CharField(
         max_length=MAX_LENGTH,
@@ -72,15 +75,49 @@ class Title(models.Model):
         validators=[validate_date],
         verbose_name='Год выпуска'
     )
+    rating_sum = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name='Сумма оценок'
+    )
+    rating_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name='Количество оценок'
+    )
+    rating = models.FloatField(
+        null=True,
+        blank=True,
+        editable=False,
+        verbose_name='Рейтинг'
+    )
 
     class Meta:
         verbose_name = 'Произведение'
         verbose_name_plural = 'Произведения'
         ordering = ('name', 'year')
+        indexes = [
+            models.Index(fields=['rating'], name='title_rating_idx'),
+        ]
 
     def __str__(self):
         return self.name
 
+    def save(self, *args, **kwargs):
+        """Рейтинг меняют только UPDATE из reviews.ratings, поэтому
+        сохранение загруженного произведения его не перезаписывает."""
+        if (
+            not args
+            and not self._state.adding
+            and kwargs.get('update_fields') is None
+            and not kwargs.get('force_insert')
+        ):
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name not in RATING_FIELDS
+            ]
+        super().save(*args, **kwargs)
+
 
 class GenreTitle(models.Model):
     title = models.ForeignKey(
@@ -98,6 +135,13 @@ class GenreTitle(models.Model):
         null=True,
     )
 
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=['genre', 'title'], name='genretitle_genre_title_idx'
+            ),
+        ]
+
     def __str__(self):
         return f'{self.genre.name} {self.title.name}'
 
@@ -127,6 +171,16 @@ class Review(models.Model):
             models.UniqueConstraint(
                 fields=['author', 'title'], name='unique_author_title'
             )]
+        indexes = [
+            models.Index(
+                fields=['title', '-pub_date', 'id'],
+                name='review_title_pub_date_idx',
+            ),
+            models.Index(
+                fields=['author', '-pub_date'],
+                name='review_author_pub_date_idx',
+            ),
+        ]
         ordering = ['-pub_date']
         verbose_name = 'Отзыв'
         verbose_name_plural = 'Отзывы'
@@ -134,6 +188,53 @@ class Review(models.Model):
     def __str__(self):
         return self.text
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """Запоминает загруженные значения для пересчёта рейтинга."""
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_values = dict(zip(field_names, values))
+        return instance
+
+    def save(self, *args, **kwargs):
+        """Сохраняет отзыв и рейтинг произведения в одной транзакции.
+
+        Внутри транзакции вызывающего кода точка сохранения не создаётся:
+        ошибка откатывает всю внешнюю транзакцию.
+        """
+        with transaction.atomic(savepoint=False):
+            super().save(*args, **kwargs)
+        self._loaded_values = {'title_id': self.title_id, 'score': self.score}
+
+
+class TitleScoreCount(models.Model):
+    """Количество отзывов произведения с каждой оценкой.
+
+    Обновляется сигналами при изменении отзывов, поэтому распределение
+    оценок, их количество и среднее читаются без группировки отзывов.
+    """
+    title = models.ForeignKey(
+        Title,
+        on_delete=models.CASCADE,
+        related_name='score_counts',
+        verbose_name='Произведение'
+    )
+    score = models.PositiveSmallIntegerField(verbose_name='Оценка')
+    count = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Количество отзывов'
+    )
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['title', 'score'], name='unique_title_score'
+            )]
+        verbose_name = 'Количество оценок'
+        verbose_name_plural = 'Количество оценок'
+
+    def __str__(self):
+        return f'{self.title_id}: {self.score} - {self.count}'
+
 
 class Comment(models.Model):
     author = models.ForeignKey(
@@ -145,6 +246,16 @@ class Comment(models.Model):
         'Дата добавления', auto_now_add=True, db_index=True)
 
     class Meta:
+        indexes = [
+            models.Index(
+                fields=['review', '-pub_date', 'id'],
+                name='comment_review_pub_date_idx',
+            ),
+            models.Index(
+                fields=['author', '-pub_date'],
+                name='comment_author_pub_date_idx',
+            ),
+        ]
         ordering = ['-pub_date']
         verbose_name = 'Комментарий'
         verbose_name_plural = 'Комментарии'
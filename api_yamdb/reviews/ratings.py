@@ -0,0 +1,139 @@
+from django.db import IntegrityError, connection, transaction
+from django.db.models import (
+    Avg, Case, Count, ExpressionWrapper, F, FloatField, OuterRef, Subquery,
+    Sum, Value, When
+)
+from django.db.models.functions import Coalesce
+
+from api_yamdb.settings import MAX_SCORE, MIN_SCORE
+from .models import Review, Title, TitleScoreCount
+
+UPSERT_VENDORS = ('postgresql', 'sqlite')
+
+
+def change_title_rating(title_id, score_delta, count_delta):
+    """Изменяет сохранённый рейтинг произведения одним UPDATE.
+
+    Возвращает количество обновлённых строк: 0 означает, что
+    произведения не существует.
+    """
+    rating_sum = F('rating_sum') + score_delta
+    rating_count = F('rating_count') + count_delta
+    return Title.objects.filter(pk=title_id).update(
+        rating_sum=rating_sum,
+        rating_count=rating_count,
+        rating=Case(
+            When(rating_count=-count_delta, then=Value(None)),
+            default=ExpressionWrapper(
+                rating_sum * 1.0 / rating_count, output_field=FloatField()
+            ),
+            output_field=FloatField(),
+        ),
+    )
+
+
+def recalculate_title_ratings(title_ids=None):
+    """Пересчитывает рейтинг произведений по всем их отзывам."""
+    titles = Title.objects.all()
+    if title_ids is not None:
+        titles = titles.filter(pk__in=title_ids)
+    reviews = Review.objects.filter(
+        title=OuterRef('pk')
+    ).order_by().values('title')
+    return titles.update(
+        rating_sum=Coalesce(
+            Subquery(reviews.annotate(total=Sum('score')).values('total')), 0
+        ),
+        rating_count=Coalesce(
+            Subquery(reviews.annotate(total=Count('pk')).values('total')), 0
+        ),
+        rating=Subquery(
+            reviews.annotate(average=Avg('score')).values('average')
+        ),
+    )
+
+
+def change_score_counts(deltas):
+    """Изменяет счётчики оценок: deltas — {(title_id, score): delta}.
+
+    Строка счётчика создаётся при первом отзыве с этой оценкой. В SQLite
+    и PostgreSQL все положительные изменения применяются одним
+    INSERT ... ON CONFLICT DO UPDATE, в остальных СУБД — UPDATE и INSERT
+    в точке сохранения при отсутствии строки.
+    """
+    increments = []
+    for (title_id, score), delta in deltas.items():
+        if delta > 0:
+            increments.append((title_id, score, delta))
+        elif delta < 0:
+            TitleScoreCount.objects.filter(
+                title_id=title_id, score=score
+            ).update(count=F('count') + delta)
+    if not increments:
+        return
+    if connection.vendor in UPSERT_VENDORS:
+        table = connection.ops.quote_name(TitleScoreCount._meta.db_table)
+        values = ', '.join(['(%s, %s, %s)'] * len(increments))
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'INSERT INTO {table} (title_id, score, count) '
+                f'VALUES {values} ON CONFLICT (title_id, score) '
+                f'DO UPDATE SET count = {table}.count + excluded.count',
+                [value for increment in increments for value in increment]
+            )
+        return
+    for title_id, score, delta in increments:
+        counts = TitleScoreCount.objects.filter(
+            title_id=title_id, score=score
+        )
+        if counts.update(count=F('count') + delta):
+            continue
+        try:
+            with transaction.atomic():
+                TitleScoreCount.objects.create(
+                    title_id=title_id, score=score, count=delta
+                )
+        except IntegrityError:
+            counts.update(count=F('count') + delta)
+
+
+def change_score_count(title_id, score, delta):
+    """Изменяет количество отзывов произведения с оценкой на delta."""
+    change_score_counts({(title_id, score): delta})
+
+
+def recalculate_score_counts(title_ids=None):
+    """Пересобирает счётчики оценок произведений по всем их отзывам."""
+    counts = TitleScoreCount.objects.all()
+    reviews = Review.objects.all()
+    if title_ids is not None:
+        counts = counts.filter(title_id__in=title_ids)
+        reviews = reviews.filter(title_id__in=title_ids)
+    with transaction.atomic():
+        counts.delete()
+        return len(TitleScoreCount.objects.bulk_create(
+            TitleScoreCount(title_id=title_id, score=score, count=count)
+            for title_id, score, count in reviews.order_by().values(
+                'title_id', 'score'
+            ).annotate(count=Count('pk')).values_list(
+                'title_id', 'score', 'count'
+            )
+        ))
+
+
+def get_score_histogram(title_id):
+    """Распределение оценок произведения, количество отзывов и среднее."""
+    counts = dict(TitleScoreCount.objects.filter(
+        title_id=title_id, count__gt=0
+    ).values_list('score', 'count'))
+    total = sum(counts.values())
+    return {
+        'scores': [
+            {'score': score, 'count': counts.get(score, 0)}
+            for score in range(MIN_SCORE, MAX_SCORE + 1)
+        ],
+        'count': total,
+        'rating': sum(
+            score * count for score, count in counts.items()
+        ) / total if total else None,
+    }
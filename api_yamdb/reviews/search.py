@@ -0,0 +1,96 @@
+import re
+
+from django.db import connections
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+
+TITLE_SEARCH_TABLE = 'reviews_title_fts'
+# Совпадение в названии весит больше, чем совпадение в описании.
+NAME_WEIGHT = 10.0
+
+INSTALL_TITLE_SEARCH_SQL = (
+    f"""CREATE VIRTUAL TABLE IF NOT EXISTS {TITLE_SEARCH_TABLE} USING fts5(
+        name, description, content='reviews_title', content_rowid='id'
+    )""",
+    f"""CREATE TRIGGER IF NOT EXISTS {TITLE_SEARCH_TABLE}_insert
+    AFTER INSERT ON reviews_title BEGIN
+        INSERT INTO {TITLE_SEARCH_TABLE}(rowid, name, description)
+        VALUES (new.id, new.name, new.description);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {TITLE_SEARCH_TABLE}_delete
+    AFTER DELETE ON reviews_title BEGIN
+        INSERT INTO {TITLE_SEARCH_TABLE}(
+            {TITLE_SEARCH_TABLE}, rowid, name, description
+        ) VALUES ('delete', old.id, old.name, old.description);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {TITLE_SEARCH_TABLE}_update
+    AFTER UPDATE OF name, description ON reviews_title BEGIN
+        INSERT INTO {TITLE_SEARCH_TABLE}(
+            {TITLE_SEARCH_TABLE}, rowid, name, description
+        ) VALUES ('delete', old.id, old.name, old.description);
+        INSERT INTO {TITLE_SEARCH_TABLE}(rowid, name, description)
+        VALUES (new.id, new.name, new.description);
+    END""",
+    f"""INSERT INTO {TITLE_SEARCH_TABLE}({TITLE_SEARCH_TABLE})
+    VALUES ('rebuild')""",
+)
+
+UNINSTALL_TITLE_SEARCH_SQL = (
+    f'DROP TRIGGER IF EXISTS {TITLE_SEARCH_TABLE}_insert',
+    f'DROP TRIGGER IF EXISTS {TITLE_SEARCH_TABLE}_delete',
+    f'DROP TRIGGER IF EXISTS {TITLE_SEARCH_TABLE}_update',
+    f'DROP TABLE IF EXISTS {TITLE_SEARCH_TABLE}',
+)
+
+
+def is_title_search_supported(connection):
+    return connection.vendor == 'sqlite'
+
+
+def install_title_search(connection):
+    """Создаёт FTS5-индекс произведений и триггеры синхронизации.
+
+    Операция идемпотентна: миграции, пересоздающие таблицу произведений
+    в SQLite, должны вызывать её повторно, так как вместе со старой
+    таблицей удаляются и триггеры.
+    """
+    if not is_title_search_supported(connection):
+        return
+    with connection.cursor() as cursor:
+        for sql in INSTALL_TITLE_SEARCH_SQL:
+            cursor.execute(sql)
+
+
+def uninstall_title_search(connection):
+    if not is_title_search_supported(connection):
+        return
+    with connection.cursor() as cursor:
+        for sql in UNINSTALL_TITLE_SEARCH_SQL:
+            cursor.execute(sql)
+
+
+def build_match_query(query):
+    """Запрос FTS5 из пользовательского ввода: все слова, поиск по префиксу."""
+    return ' '.join(f'"{word}"*' for word in re.findall(r'\w+', query))
+
+
+def search_titles(queryset, query):
+    """Отбирает произведения по поисковому запросу, лучшие — первыми."""
+    match = build_match_query(query)
+    if not match:
+        return queryset.none()
+    if not is_title_search_supported(connections[queryset.db]):
+        return queryset.filter(
+            Q(name__icontains=query) | Q(description__icontains=query)
+        )
+    return queryset.filter(id__in=RawSQL(
+        f'SELECT rowid FROM {TITLE_SEARCH_TABLE} '
+        f'WHERE {TITLE_SEARCH_TABLE} MATCH %s',
+        (match,)
+    )).annotate(search_rank=RawSQL(
+        f'SELECT bm25({TITLE_SEARCH_TABLE}, {NAME_WEIGHT}, 1.0) '
+        f'FROM {TITLE_SEARCH_TABLE} '
+        f'WHERE {TITLE_SEARCH_TABLE} MATCH %s '
+        f'AND rowid = {queryset.model._meta.db_table}.id',
+        (match,)
+    )).order_by('search_rank', 'name', 'id')
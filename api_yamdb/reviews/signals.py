@@ -0,0 +1,76 @@
+import threading
+from contextlib import contextmanager
+
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import Review
+from .ratings import (
+    change_score_count, change_title_rating, recalculate_score_counts,
+    recalculate_title_ratings
+)
+
+_state = threading.local()
+
+
+@contextmanager
+def suspend_review_signals():
+    """Отключает обработчики сигналов отзывов и комментариев в потоке.
+
+    Для массовых операций: вызывающий код сам пересчитывает рейтинги,
+    счётчики и сбрасывает кэш один раз на всю операцию.
+    """
+    previous = review_signals_suspended()
+    _state.suspended = True
+    try:
+        yield
+    finally:
+        _state.suspended = previous
+
+
+def review_signals_suspended():
+    return getattr(_state, 'suspended', False)
+
+
+@receiver(post_save, sender=Review)
+def update_rating_on_review_save(sender, instance, created, **kwargs):
+    """Учитывает новый или изменённый отзыв в рейтинге произведения.
+
+    Для нового отзыва в title_rating_updated отмечается, обновил ли
+    UPDATE рейтинга строку произведения: по этой отметке создание
+    отзыва в API проверяет, что произведение существует.
+    """
+    if review_signals_suspended():
+        return
+    if created:
+        instance.title_rating_updated = bool(
+            change_title_rating(instance.title_id, instance.score, 1)
+        )
+        if instance.title_rating_updated:
+            change_score_count(instance.title_id, instance.score, 1)
+        return
+    loaded = getattr(instance, '_loaded_values', {})
+    if 'title_id' not in loaded or 'score' not in loaded:
+        recalculate_title_ratings([instance.title_id])
+        recalculate_score_counts([instance.title_id])
+        return
+    if loaded['title_id'] != instance.title_id:
+        change_title_rating(loaded['title_id'], -loaded['score'], -1)
+        change_title_rating(instance.title_id, instance.score, 1)
+    elif loaded['score'] != instance.score:
+        change_title_rating(
+            instance.title_id, instance.score - loaded['score'], 0
+        )
+    else:
+        return
+    change_score_count(loaded['title_id'], loaded['score'], -1)
+    change_score_count(instance.title_id, instance.score, 1)
+
+
+@receiver(post_delete, sender=Review)
+def update_rating_on_review_delete(sender, instance, **kwargs):
+    """Исключает удалённый отзыв из рейтинга произведения."""
+    if review_signals_suspended():
+        return
+    change_title_rating(instance.title_id, -instance.score, -1)
+    change_score_count(instance.title_id, instance.score, -1)
@@ -0,0 +1,38 @@
+import time
+
+from django.core.management import BaseCommand
+
+from api_yamdb.settings import OUTBOX_BATCH_SIZE, OUTBOX_POLL_INTERVAL
+from users.outbox import send_outbox
+
+
+class Command(BaseCommand):
+    help = (
+        'Отправляет письма из очереди пачками с повторными попытками. '
+        'С --loop работает постоянно, проверяя очередь с интервалом.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=OUTBOX_BATCH_SIZE,
+            help='Количество писем в пачке на одно соединение с почтой.'
+        )
+        parser.add_argument(
+            '--loop', action='store_true',
+            help='Не завершаться после отправки очереди.'
+        )
+        parser.add_argument(
+            '--interval', type=float, default=OUTBOX_POLL_INTERVAL,
+            help='Пауза между проверками очереди в секундах.'
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            sent, failed = send_outbox(options['batch_size'])
+            if sent or failed or not options['loop']:
+                self.stdout.write(
+                    f'Отправлено писем: {sent}, не отправлено: {failed}'
+                )
+            if not options['loop']:
+                return
+            time.sleep(options['interval'])
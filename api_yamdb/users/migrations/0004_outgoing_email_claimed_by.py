@@ -0,0 +1,18 @@
+# Generated by Django 3.2 on 2026-10-18 18:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0003_user_token_version'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='outgoingemail',
+            name='claimed_by',
+            field=models.UUIDField(blank=True, null=True, verbose_name='Обработчик'),
+        ),
+    ]
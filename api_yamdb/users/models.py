@@ -1,13 +1,15 @@
 from django.contrib.auth.validators import UnicodeUsernameValidator
 from django.contrib.auth.models import AbstractUser
 from django.db import models
+from django.utils import timezone
 
 from api.v1.validators import validate_username
 from api_yamdb.settings import (
     MAX_LENGTH_USERNAME,
     MAX_LENGTH_FIRST_NAME,
     MAX_LENGTH_LAST_NAME,
-    MAX_LENGTH_ROLE
+    MAX_LENGTH_ROLE,
+    MAX_LENGTH_SUBJECT
 )
 
 
@@ -39,6 +41,13 @@ class User(AbstractUser):
         'Права доступа', max_length=MAX_LENGTH_ROLE, choices=USER_ROLES,
         default=USER
     )
+    token_version = models.PositiveIntegerField(
+        'Версия токенов', default=0, editable=False
+    )
+
+    # Поля, значения которых записываются в токен доступа: их изменение
+    # повышает token_version и отзывает выданные токены.
+    TOKEN_CLAIM_FIELDS = ('role', 'is_superuser', 'is_active')
 
     class Meta:
         ordering = ['username']
@@ -51,5 +60,73 @@ class User(AbstractUser):
     def is_moderator(self):
         return self.role == self.MODERATOR
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """Запоминает загруженные значения полей из токена доступа
+        и имя пользователя, которое показывается в отзывах и комментариях."""
+        instance = super().from_db(db, field_names, values)
+        loaded = dict(zip(field_names, values))
+        instance._loaded_claims = {
+            name: value for name, value in loaded.items()
+            if name in cls.TOKEN_CLAIM_FIELDS
+        }
+        instance._loaded_username = loaded.get('username')
+        return instance
+
+    def save(self, *args, **kwargs):
+        """Повышает версию токенов при изменении прав пользователя."""
+        loaded = getattr(self, '_loaded_claims', {})
+        if any(
+            loaded[name] != getattr(self, name)
+            for name in self.TOKEN_CLAIM_FIELDS if name in loaded
+        ):
+            self.token_version += 1
+            update_fields = kwargs.get('update_fields')
+            if update_fields is not None:
+                kwargs['update_fields'] = {*update_fields, 'token_version'}
+        super().save(*args, **kwargs)
+        self._loaded_claims = {
+            name: getattr(self, name) for name in self.TOKEN_CLAIM_FIELDS
+        }
+        self._loaded_username = self.username
+
     def __str__(self):
         return self.username
+
+
+class OutgoingEmail(models.Model):
+    """Письмо в очереди на отправку.
+
+    Запросы только ставят письма в очередь, отправляет их команда
+    send_outbox пачками с повторными попытками. На время отправки
+    обработчик записывает в claimed_by свой идентификатор и сдвигает
+    next_attempt_at на срок аренды.
+    """
+    subject = models.CharField('Тема', max_length=MAX_LENGTH_SUBJECT)
+    message = models.TextField('Текст')
+    from_email = models.EmailField('Отправитель')
+    recipient = models.EmailField('Получатель')
+    created_at = models.DateTimeField('Дата создания', auto_now_add=True)
+    attempts = models.PositiveSmallIntegerField(
+        'Количество попыток', default=0
+    )
+    next_attempt_at = models.DateTimeField(
+        'Время следующей попытки', default=timezone.now
+    )
+    sent_at = models.DateTimeField('Дата отправки', null=True, blank=True)
+    claimed_by = models.UUIDField('Обработчик', null=True, blank=True)
+    last_error = models.TextField('Последняя ошибка', blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=['sent_at', 'next_attempt_at'],
+                name='outgoingemail_due_idx',
+            ),
+        ]
+        ordering = ['next_attempt_at', 'id']
+        verbose_name = 'Исходящее письмо'
+        verbose_name_plural = 'Исходящие письма'
+
+    def __str__(self):
+        return f'{self.recipient}: {self.subject}'
@@ -0,0 +1,152 @@
+import uuid
+from contextlib import nullcontext
+from datetime import timedelta
+
+from django.core.mail import EmailMessage, get_connection
+from django.db import connection, transaction
+from django.utils import timezone
+
+from api_yamdb.settings import (
+    EMAIL, OUTBOX_BATCH_SIZE, OUTBOX_LEASE_TIMEOUT, OUTBOX_MAX_ATTEMPTS,
+    OUTBOX_MAX_RETRY_DELAY, OUTBOX_RETRY_DELAY
+)
+from .models import OutgoingEmail
+
+
+def enqueue_email(subject, message, recipient, from_email=EMAIL):
+    """Ставит письмо в очередь на отправку."""
+    return OutgoingEmail.objects.create(
+        subject=subject,
+        message=message,
+        from_email=from_email,
+        recipient=recipient,
+    )
+
+
+def enqueue_emails(emails, from_email=EMAIL, batch_size=None):
+    """Ставит в очередь пачку писем: emails — тройки
+    (тема, текст, получатель)."""
+    return OutgoingEmail.objects.bulk_create(
+        (
+            OutgoingEmail(
+                subject=subject,
+                message=message,
+                from_email=from_email,
+                recipient=recipient,
+            )
+            for subject, message, recipient in emails
+        ),
+        batch_size=batch_size,
+    )
+
+
+def get_retry_delay(attempts):
+    """Задержка перед следующей попыткой: удваивается с каждой неудачей."""
+    return timedelta(seconds=min(
+        OUTBOX_RETRY_DELAY * 2 ** (attempts - 1), OUTBOX_MAX_RETRY_DELAY
+    ))
+
+
+def claim_due_emails(batch_size):
+    """Забирает пачку писем, время попытки которых наступило.
+
+    Письма отмечаются идентификатором обработчика, а next_attempt_at
+    сдвигается на OUTBOX_LEASE_TIMEOUT, поэтому другие обработчики
+    их не выберут. Отметка — условный UPDATE: письма, которые успел
+    забрать параллельный обработчик, ему не достаются. В СУБД с
+    SELECT ... SKIP LOCKED выбор и отметка идут одной транзакцией,
+    в SQLite — отдельными запросами без транзакции, чтобы читающая
+    транзакция не конфликтовала с записью других процессов.
+    """
+    claim = uuid.uuid4()
+    now = timezone.now()
+    due = OutgoingEmail.objects.filter(
+        sent_at__isnull=True,
+        next_attempt_at__lte=now,
+        attempts__lt=OUTBOX_MAX_ATTEMPTS,
+    )
+    skip_locked = connection.features.has_select_for_update_skip_locked
+    with transaction.atomic() if skip_locked else nullcontext():
+        ids = due.values_list('id', flat=True)
+        if skip_locked:
+            ids = ids.select_for_update(skip_locked=True)
+        ids = list(ids[:batch_size])
+        if not ids:
+            return []
+        due.filter(id__in=ids).update(
+            claimed_by=claim,
+            next_attempt_at=now + timedelta(seconds=OUTBOX_LEASE_TIMEOUT),
+        )
+    return list(OutgoingEmail.objects.filter(claimed_by=claim))
+
+
+def deliver_emails(emails):
+    """Отправляет письма через одно соединение с почтой.
+
+    Возвращает id отправленных писем и пары (письмо, ошибка).
+    """
+    sent = []
+    failed = []
+    mail_connection = get_connection()
+    try:
+        mail_connection.open()
+    except Exception as error:
+        return sent, [(email, error) for email in emails]
+    for email in emails:
+        try:
+            EmailMessage(
+                subject=email.subject,
+                body=email.message,
+                from_email=email.from_email,
+                to=(email.recipient,),
+                connection=mail_connection,
+            ).send()
+        except Exception as error:
+            failed.append((email, error))
+        else:
+            sent.append(email.id)
+    mail_connection.close()
+    return sent, failed
+
+
+def send_outbox_batch(batch_size=OUTBOX_BATCH_SIZE):
+    """Отправляет одну пачку писем через одно соединение с почтой.
+
+    Пачка забирается и результаты отмечаются короткими транзакциями,
+    а сама отправка идёт вне транзакции, поэтому медленная почта
+    не блокирует запись в БД, например постановку писем в очередь
+    при регистрации. Отправленные письма отмечаются одним UPDATE,
+    неудачные откладываются на следующую попытку.
+    Возвращает количество отправленных и неудачных писем.
+    """
+    emails = claim_due_emails(batch_size)
+    if not emails:
+        return 0, 0
+    sent, failed = deliver_emails(emails)
+    now = timezone.now()
+    with transaction.atomic():
+        OutgoingEmail.objects.filter(id__in=sent).update(
+            sent_at=now, claimed_by=None
+        )
+        for email, error in failed:
+            attempts = email.attempts + 1
+            OutgoingEmail.objects.filter(
+                id=email.id, claimed_by=email.claimed_by
+            ).update(
+                attempts=attempts,
+                next_attempt_at=now + get_retry_delay(attempts),
+                last_error=repr(error),
+                claimed_by=None,
+            )
+    return len(sent), len(failed)
+
+
+def send_outbox(batch_size=OUTBOX_BATCH_SIZE):
+    """Отправляет пачками все письма, время попытки которых наступило."""
+    total_sent = total_failed = 0
+    while True:
+        sent, failed = send_outbox_batch(batch_size)
+        total_sent += sent
+        total_failed += failed
+        if not sent:
+            return total_sent, total_failed
@@ -0,0 +1,12 @@
+import pytest
+from django.core.cache import caches
+
+from api.v1.authentication import user_cache
+
+
+@pytest.fixture(autouse=True)
+def clear_caches():
+    for cache in caches.all():
+        cache.clear()
+    user_cache.clear()
+    yield
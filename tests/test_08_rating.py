@@ -0,0 +1,153 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from api.serializers import TitleRatingProvider, TitleReadSerializer
+from reviews.models import Title
+from tests.utils import create_reviews
+
+
+@pytest.mark.django_db(transaction=True)
+class Test08TitleRating:
+
+    TITLE_DETAIL_URL_TEMPLATE = '/api/v1/titles/{title_id}/'
+    REVIEW_DETAIL_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/'
+    )
+
+    def get_title(self, client, title_id):
+        response = client.get(
+            self.TITLE_DETAIL_URL_TEMPLATE.format(title_id=title_id)
+        )
+        assert response.status_code == HTTPStatus.OK
+        return response.json()
+
+    def test_01_rating_follows_reviews(self, client, admin_client, admin,
+                                       user_client, user):
+        author_map = {admin: admin_client, user: user_client}
+        reviews, titles = create_reviews(admin_client, author_map)
+        title_id = titles[0]['id']
+        assert self.get_title(client, title_id)['rating'] == 5, (
+            'Проверьте, что рейтинг произведения пересчитывается '
+            'при создании отзыва.'
+        )
+
+        response = user_client.patch(
+            self.REVIEW_DETAIL_URL_TEMPLATE.format(
+                title_id=title_id, review_id=reviews[1]['id']
+            ),
+            data={'score': 9}
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert self.get_title(client, title_id)['rating'] == 7, (
+            'Проверьте, что рейтинг произведения пересчитывается '
+            'при изменении оценки отзыва.'
+        )
+
+        response = admin_client.delete(
+            self.REVIEW_DETAIL_URL_TEMPLATE.format(
+                title_id=title_id, review_id=reviews[0]['id']
+            )
+        )
+        assert response.status_code == HTTPStatus.NO_CONTENT
+        assert self.get_title(client, title_id)['rating'] == 9, (
+            'Проверьте, что рейтинг произведения пересчитывается '
+            'при удалении отзыва.'
+        )
+
+        admin_client.delete(
+            self.REVIEW_DETAIL_URL_TEMPLATE.format(
+                title_id=title_id, review_id=reviews[1]['id']
+            )
+        )
+        assert self.get_title(client, title_id)['rating'] is None, (
+            'Проверьте, что у произведения без отзывов рейтинг равен `None`.'
+        )
+
+    def test_02_recalculate_ratings_command(self, client, admin_client, admin,
+                                            user_client, user):
+        author_map = {admin: admin_client, user: user_client}
+        _, titles = create_reviews(admin_client, author_map)
+        Title.objects.update(rating_sum=0, rating_count=0, rating=None)
+
+        call_command('recalculate_ratings')
+
+        title = Title.objects.get(pk=titles[0]['id'])
+        assert (title.rating_sum, title.rating_count) == (10, 2), (
+            'Проверьте, что команда `recalculate_ratings` восстанавливает '
+            'сумму и количество оценок произведения.'
+        )
+        assert self.get_title(client, titles[0]['id'])['rating'] == 5
+        assert self.get_title(client, titles[1]['id'])['rating'] is None
+
+    def test_03_title_save_keeps_rating(self, client, admin_client, admin,
+                                        user):
+        title = Title.objects.create(name='Терминатор', year=1984)
+        loaded = Title.objects.get(pk=title.id)
+        title.reviews.create(author=user, text='-', score=8)
+        loaded.name = 'Терминатор 2'
+        loaded.save()
+        title.refresh_from_db()
+        assert (title.rating_sum, title.rating_count, title.rating) == (
+            8, 1, 8
+        ), (
+            'Проверьте, что сохранение загруженного произведения '
+            'не перезаписывает рейтинг, изменённый после загрузки.'
+        )
+        assert title.name == 'Терминатор 2'
+
+        response = admin_client.patch(
+            self.TITLE_DETAIL_URL_TEMPLATE.format(title_id=title.id),
+            data='{"year": 1991}', content_type='application/json'
+        )
+        assert response.status_code == HTTPStatus.OK
+        title.refresh_from_db()
+        assert (title.year, title.rating) == (1991, 8)
+
+    def test_04_legacy_serializer_rating_provider(self, django_user_model):
+        authors = [
+            django_user_model.objects.create_user(
+                username=f'critic{number}', email=f'critic{number}@yamdb.fake'
+            )
+            for number in range(3)
+        ]
+        scores = {'Крик': (7, 8, 8), 'Маска': (3, 3, 4), 'Чужой': ()}
+        for name, title_scores in scores.items():
+            title = Title.objects.create(name=name, year=2000)
+            for author, score in zip(authors, title_scores):
+                title.reviews.create(author=author, text='-', score=score)
+        titles = Title.objects.select_related('category').prefetch_related(
+            'genre'
+        ).order_by('name')
+        expected = {'Крик': 8, 'Маска': 3, 'Чужой': None}
+
+        page = list(titles)
+        with CaptureQueriesContext(connection) as context:
+            data = TitleReadSerializer(page, many=True).data
+        assert {title['name']: title['rating'] for title in data} == expected
+        review_queries = [
+            query['sql'] for query in context.captured_queries
+            if 'reviews_review' in query['sql']
+        ]
+        assert len(review_queries) == 1, (
+            'Проверьте, что рейтинги страницы произведений считаются одним '
+            'сгруппированным запросом.'
+        )
+
+        page = list(titles)
+        provider = TitleRatingProvider(page)
+        with CaptureQueriesContext(connection) as context:
+            data = TitleReadSerializer(
+                page, many=True, context={'rating_provider': provider}
+            ).data
+        assert {title['name']: title['rating'] for title in data} == expected
+        assert not [
+            query for query in context.captured_queries
+            if 'reviews_review' in query['sql']
+        ], (
+            'Проверьте, что сериализатор использует провайдер рейтинга, '
+            'переданный в контексте.'
+        )
@@ -0,0 +1,268 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.exceptions import ImproperlyConfigured
+from django.db import IntegrityError
+from rest_framework import serializers
+
+from api.v1.mixins import NestedParentMixin
+from api.v1.serializers import ReviewSerializer
+from reviews.models import Category, Genre, Review, Title
+from reviews.signals import suspend_review_signals
+from tests.utils import capture_queries
+
+
+def create_catalogue(size):
+    category = Category.objects.create(name='Фильм', slug='films')
+    genres = [
+        Genre.objects.create(name='Ужасы', slug='horror'),
+        Genre.objects.create(name='Комедия', slug='comedy'),
+    ]
+    titles = []
+    for idx in range(size):
+        title = Title.objects.create(
+            name=f'Произведение {idx}', year=2000, category=category
+        )
+        title.genre.set(genres)
+        titles.append(title)
+    return titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test09QueryBudget:
+
+    TITLES_URL = '/api/v1/titles/'
+    TITLES_DETAIL_URL_TEMPLATE = '/api/v1/titles/{title_id}/'
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+    COMMENTS_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/comments/'
+    )
+
+    TITLES_LIST_BUDGET = 3
+    TITLES_DETAIL_BUDGET = 2
+    TITLES_WRITE_BUDGET = 10
+    REVIEW_CREATE_BUDGET = 5
+    NESTED_LIST_BUDGET = 2
+    NESTED_DETAIL_BUDGET = 1
+    SIGNUP_BUDGET = 4
+
+    def assert_budget(self, url, queries, budget, method='GET'):
+        assert len(queries) <= budget, (
+            f'Проверьте, что {method}-запрос к `{url}` выполняет не более '
+            f'{budget} запросов к БД. Сейчас выполняется {len(queries)}.'
+        )
+
+    def test_01_titles_list(self, client):
+        create_catalogue(2)
+        response, small_page = capture_queries(client, self.TITLES_URL)
+        assert response.status_code == HTTPStatus.OK
+        Title.objects.all().delete()
+        Category.objects.all().delete()
+        Genre.objects.all().delete()
+
+        create_catalogue(10)
+        response, full_page = capture_queries(client, self.TITLES_URL)
+        assert response.status_code == HTTPStatus.OK
+        assert len(response.json()['results']) == 10
+
+        assert len(small_page) == len(full_page), (
+            f'Проверьте, что количество запросов к БД при GET-запросе к '
+            f'`{self.TITLES_URL}` не зависит от размера страницы.'
+        )
+        self.assert_budget(self.TITLES_URL, full_page, self.TITLES_LIST_BUDGET)
+
+    def test_02_titles_detail(self, client):
+        title = create_catalogue(1)[0]
+        url = self.TITLES_DETAIL_URL_TEMPLATE.format(title_id=title.id)
+        response, queries = capture_queries(client, url)
+        assert response.status_code == HTTPStatus.OK
+        self.assert_budget(url, queries, self.TITLES_DETAIL_BUDGET)
+
+    def test_03_titles_write_echo(self, admin_client):
+        create_catalogue(0)
+        data = {
+            'name': 'Терминатор',
+            'year': 1984,
+            'genre': ['horror', 'comedy'],
+            'category': 'films',
+        }
+        response, queries = capture_queries(
+            admin_client, self.TITLES_URL, method='post', data=data
+        )
+        assert response.status_code == HTTPStatus.CREATED
+        assert len(response.json()['genre']) == 2
+        self.assert_budget(
+            self.TITLES_URL, queries, self.TITLES_WRITE_BUDGET, 'POST'
+        )
+
+        url = self.TITLES_DETAIL_URL_TEMPLATE.format(
+            title_id=response.json()['id']
+        )
+        response, queries = capture_queries(
+            admin_client, url, method='patch', data={'genre': ['horror']}
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert response.json()['genre'] == [
+            {'name': 'Ужасы', 'slug': 'horror'}
+        ]
+        self.assert_budget(url, queries, self.TITLES_WRITE_BUDGET, 'PATCH')
+
+    def test_04_review_create(self, user_client):
+        title = create_catalogue(1)[0]
+        url = self.REVIEWS_URL_TEMPLATE.format(title_id=title.id)
+        data = {'text': 'Отлично', 'score': 9}
+        response, queries = capture_queries(
+            user_client, url, method='post', data=data
+        )
+        assert response.status_code == HTTPStatus.CREATED
+        self.assert_budget(url, queries, self.REVIEW_CREATE_BUDGET, 'POST')
+
+        response, queries = capture_queries(
+            user_client, url, method='post', data=data
+        )
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        self.assert_budget(url, queries, self.REVIEW_CREATE_BUDGET, 'POST')
+
+        url = self.REVIEWS_URL_TEMPLATE.format(title_id=title.id + 1)
+        response, queries = capture_queries(
+            user_client, url, method='post', data=data
+        )
+        assert response.status_code == HTTPStatus.NOT_FOUND
+        self.assert_budget(url, queries, self.REVIEW_CREATE_BUDGET, 'POST')
+
+    def test_05_nested_parent_lookups(self, client, admin):
+        title = create_catalogue(1)[0]
+        review = title.reviews.create(author=admin, text='a', score=5)
+        review.comments.create(author=admin, text='b')
+        urls = (
+            (
+                self.REVIEWS_URL_TEMPLATE.format(title_id=title.id),
+                'FROM "reviews_title"',
+            ),
+            (
+                self.COMMENTS_URL_TEMPLATE.format(
+                    title_id=title.id, review_id=review.id
+                ),
+                'FROM "reviews_review"',
+            ),
+        )
+        for url, parent_table in urls:
+            response, parent_lookups = capture_queries(
+                client, url, match=parent_table
+            )
+            assert response.status_code == HTTPStatus.OK
+            assert not parent_lookups, (
+                f'Проверьте, что GET-запрос к непустому списку `{url}` '
+                'не загружает родительский объект отдельным запросом.'
+            )
+
+        response = client.get(
+            self.REVIEWS_URL_TEMPLATE.format(title_id=title.id + 1)
+        )
+        assert response.status_code == HTTPStatus.NOT_FOUND
+        response = client.get(self.COMMENTS_URL_TEMPLATE.format(
+            title_id=title.id + 1, review_id=review.id
+        ))
+        assert response.status_code == HTTPStatus.NOT_FOUND, (
+            'Проверьте, что список комментариев к отзыву другого '
+            'произведения возвращает ответ со статусом 404.'
+        )
+
+        with pytest.raises(ImproperlyConfigured):
+            type('UnboundViewSet', (NestedParentMixin,), {})
+
+    def test_06_nested_lists_join_authors(self, client, django_user_model):
+        title = create_catalogue(1)[0]
+        authors = [
+            django_user_model.objects.create_user(
+                username=f'critic{idx}', email=f'critic{idx}@yamdb.fake'
+            )
+            for idx in range(10)
+        ]
+        reviews = [
+            title.reviews.create(author=author, text='-', score=5)
+            for author in authors
+        ]
+        for author in authors:
+            reviews[0].comments.create(author=author, text='-')
+        reviews_url = self.REVIEWS_URL_TEMPLATE.format(title_id=title.id)
+        comments_url = self.COMMENTS_URL_TEMPLATE.format(
+            title_id=title.id, review_id=reviews[0].id
+        )
+
+        for url in (reviews_url, comments_url):
+            response, queries = capture_queries(client, url)
+            assert response.status_code == HTTPStatus.OK
+            results = response.json()['results']
+            assert len(results) == 10
+            assert {item['author'] for item in results} == {
+                author.username for author in authors
+            }
+            self.assert_budget(url, queries, self.NESTED_LIST_BUDGET)
+
+        for url in (
+            f'{reviews_url}{reviews[0].id}/',
+            f'{comments_url}{reviews[0].comments.first().id}/',
+        ):
+            response, queries = capture_queries(client, url)
+            assert response.status_code == HTTPStatus.OK
+            self.assert_budget(url, queries, self.NESTED_DETAIL_BUDGET)
+
+    def test_07_signup(self, client, django_user_model):
+        url = '/api/v1/auth/signup/'
+        data = {'username': 'valid_username', 'email': 'valid@yamdb.fake'}
+        for expected_status in (HTTPStatus.OK, HTTPStatus.OK):
+            response, queries = capture_queries(
+                client, url, method='post', data=data
+            )
+            assert response.status_code == expected_status
+            self.assert_budget(url, queries, self.SIGNUP_BUDGET, 'POST')
+
+        for taken, field in (
+            ({'username': 'valid_username', 'email': 'other@yamdb.fake'},
+             'username'),
+            ({'username': 'other', 'email': 'valid@yamdb.fake'}, 'email'),
+        ):
+            response, queries = capture_queries(
+                client, url, method='post', data=taken
+            )
+            assert response.status_code == HTTPStatus.BAD_REQUEST
+            assert list(response.json()) == [field]
+            assert len(queries) == 1, (
+                'Проверьте, что занятые username и email при регистрации '
+                'определяются одним запросом к БД.'
+            )
+        assert django_user_model.objects.count() == 1
+
+    def test_08_review_create_errors(self, user, monkeypatch):
+        title = create_catalogue(1)[0]
+        data = {'text': 'Отлично', 'score': 9}
+
+        def save(title_id):
+            serializer = ReviewSerializer(data=data)
+            serializer.is_valid(raise_exception=True)
+            return serializer.save(title_id=title_id, author=user)
+
+        with suspend_review_signals():
+            with pytest.raises(Title.DoesNotExist):
+                save(title.id + 1)
+        assert not Review.objects.exists(), (
+            'Проверьте, что отзыв на несуществующее произведение '
+            'не создаётся и при отключённых сигналах отзывов.'
+        )
+
+        def insert_fails(self, validated_data):
+            raise IntegrityError('FOREIGN KEY constraint failed')
+
+        monkeypatch.setattr(
+            serializers.ModelSerializer, 'create', insert_fails
+        )
+        with pytest.raises(Title.DoesNotExist):
+            save(title.id + 1)
+        with pytest.raises(IntegrityError):
+            save(title.id)
+        monkeypatch.undo()
+
+        save(title.id)
+        with pytest.raises(serializers.ValidationError):
+            save(title.id)
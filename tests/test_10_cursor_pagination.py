@@ -0,0 +1,85 @@
+from http import HTTPStatus
+
+import pytest
+
+from reviews.models import Review, Title
+
+
+def walk(client, url, link_key):
+    pages = []
+    while url:
+        response = client.get(url)
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что GET-запрос к `{url}` в курсорном режиме '
+            'возвращает ответ со статусом 200.'
+        )
+        data = response.json()
+        assert 'count' not in data, (
+            'Проверьте, что курсорный режим пагинации не считает '
+            'общее количество объектов.'
+        )
+        pages.append([obj['id'] for obj in data['results']])
+        url = data[link_key]
+    return pages
+
+
+@pytest.mark.django_db(transaction=True)
+class Test10CursorPagination:
+
+    TITLES_URL = '/api/v1/titles/'
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+
+    def test_01_titles_cursor_walk(self, client):
+        for idx in range(23):
+            Title.objects.create(name=f'Произведение {idx % 7}', year=2000)
+        expected = list(
+            Title.objects.order_by('name', 'year', 'id').values_list(
+                'id', flat=True
+            )
+        )
+
+        pages = walk(client, f'{self.TITLES_URL}?pagination=cursor', 'next')
+        assert [len(page) for page in pages] == [10, 10, 3]
+        assert sum(pages, []) == expected, (
+            f'Проверьте, что курсорный обход `{self.TITLES_URL}` возвращает '
+            'все произведения по одному разу в порядке (name, year, id).'
+        )
+
+        last_page_url = client.get(
+            f'{self.TITLES_URL}?pagination=cursor'
+        ).json()['next']
+        last_page_url = client.get(last_page_url).json()['next']
+        back_pages = walk(client, last_page_url, 'previous')
+        assert sum(reversed(back_pages), []) == expected, (
+            'Проверьте, что ссылка `previous` в курсорном режиме '
+            'возвращает предыдущие страницы.'
+        )
+
+    def test_02_reviews_cursor_walk(self, client, django_user_model):
+        title = Title.objects.create(name='Терминатор', year=1984)
+        for idx in range(12):
+            author = django_user_model.objects.create(
+                username=f'author{idx}', email=f'author{idx}@yamdb.fake'
+            )
+            Review.objects.create(
+                title=title, author=author, text=str(idx), score=5
+            )
+        Review.objects.update(pub_date=Review.objects.first().pub_date)
+        expected = list(
+            Review.objects.order_by('-pub_date', 'id').values_list(
+                'id', flat=True
+            )
+        )
+        url = self.REVIEWS_URL_TEMPLATE.format(title_id=title.id)
+        pages = walk(client, f'{url}?pagination=cursor', 'next')
+        assert sum(pages, []) == expected, (
+            f'Проверьте, что курсорный обход `{self.REVIEWS_URL_TEMPLATE}` '
+            'возвращает все отзывы по одному разу в порядке (-pub_date, id).'
+        )
+
+    def test_03_invalid_cursor(self, client):
+        response = client.get(f'{self.TITLES_URL}?cursor=broken')
+        assert response.status_code == HTTPStatus.NOT_FOUND, (
+            'Проверьте, что некорректный курсор возвращает ответ '
+            'со статусом 404.'
+        )
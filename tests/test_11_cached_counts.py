@@ -0,0 +1,134 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.cache import cache
+from django.db import transaction
+
+from api.v1 import pagination
+from api.v1.cache import get_count_key
+from reviews.models import Comment, Review, Title
+from tests.utils import capture_queries
+
+
+def get_with_queries(client, url):
+    """Данные страницы и выполненные при запросе COUNT(*)."""
+    response, count_queries = capture_queries(client, url, match='COUNT(')
+    assert response.status_code == HTTPStatus.OK
+    return response.json(), count_queries
+
+
+@pytest.mark.django_db(transaction=True)
+class Test11CachedCounts:
+
+    TITLES_URL = '/api/v1/titles/'
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+    COMMENTS_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/comments/'
+    )
+
+    def test_01_reviews_count_cached_and_invalidated(self, client, admin,
+                                                      user):
+        title = Title.objects.create(name='Терминатор', year=1984)
+        Review.objects.create(title=title, author=admin, text='a', score=5)
+        url = self.REVIEWS_URL_TEMPLATE.format(title_id=title.id)
+
+        data, count_queries = get_with_queries(client, url)
+        assert data['count'] == 1
+        assert count_queries
+
+        data, count_queries = get_with_queries(client, url)
+        assert data['count'] == 1
+        assert not count_queries, (
+            f'Проверьте, что повторный GET-запрос к `{url}` не выполняет '
+            'COUNT(*), а берёт количество отзывов из кэша.'
+        )
+
+        review = Review.objects.create(
+            title=title, author=user, text='b', score=5
+        )
+        data, _ = get_with_queries(client, url)
+        assert data['count'] == 2, (
+            'Проверьте, что кэш количества отзывов сбрасывается '
+            'при создании отзыва.'
+        )
+
+        review.delete()
+        data, _ = get_with_queries(client, url)
+        assert data['count'] == 1, (
+            'Проверьте, что кэш количества отзывов сбрасывается '
+            'при удалении отзыва.'
+        )
+
+    def test_02_filtered_titles_count_exact(self, client):
+        Title.objects.create(name='Терминатор', year=1984)
+        Title.objects.create(name='Крепкий орешек', year=1988)
+
+        data, _ = get_with_queries(client, self.TITLES_URL)
+        assert data['count'] == 2
+        data, count_queries = get_with_queries(
+            client, f'{self.TITLES_URL}?year=1984'
+        )
+        assert data['count'] == 1 and count_queries, (
+            'Проверьте, что для отфильтрованного списка произведений '
+            'количество считается точно.'
+        )
+
+    def test_03_comments_count_scoped_by_title(self, client, admin):
+        title = Title.objects.create(name='Терминатор', year=1984)
+        other = Title.objects.create(name='Крепкий орешек', year=1988)
+        review = Review.objects.create(
+            title=title, author=admin, text='a', score=5
+        )
+        Comment.objects.create(review=review, author=admin, text='b')
+        response = client.get(self.COMMENTS_URL_TEMPLATE.format(
+            title_id=other.id, review_id=review.id
+        ))
+        assert response.status_code == HTTPStatus.NOT_FOUND
+        data, _ = get_with_queries(client, self.COMMENTS_URL_TEMPLATE.format(
+            title_id=title.id, review_id=review.id
+        ))
+        assert data['count'] == 1 and len(data['results']) == 1, (
+            'Проверьте, что запрос комментариев с чужим произведением '
+            'не кэширует количество для настоящего адреса.'
+        )
+
+    def test_04_stale_count_does_not_truncate(self, client, monkeypatch):
+        for idx in range(12):
+            Title.objects.create(name=f'Произведение {idx:02}', year=2000)
+        cache.set(get_count_key(Title), 0)
+        data, _ = get_with_queries(client, self.TITLES_URL)
+        assert len(data['results']) == 10 and data['next'], (
+            'Проверьте, что устаревшее количество в кэше не обрезает '
+            'страницу и не убирает ссылку на следующую.'
+        )
+        data, _ = get_with_queries(client, data['next'])
+        assert len(data['results']) == 2 and data['next'] is None
+
+        cache.clear()
+        monkeypatch.setattr(pagination, 'APPROXIMATE_COUNT_THRESHOLD', 1)
+        monkeypatch.setattr(
+            pagination, 'get_approximate_count', lambda model: 3
+        )
+        data, _ = get_with_queries(client, f'{self.TITLES_URL}?page=2')
+        assert data['count'] == 3 and len(data['results']) == 2, (
+            'Проверьте, что последние страницы доступны, даже если оценка '
+            'количества меньше настоящего.'
+        )
+        response = client.get(f'{self.TITLES_URL}?page=3')
+        assert response.status_code == HTTPStatus.NOT_FOUND
+
+    def test_05_count_invalidated_after_commit(self, client, admin, user):
+        title = Title.objects.create(name='Терминатор', year=1984)
+        Review.objects.create(title=title, author=admin, text='a', score=5)
+        url = self.REVIEWS_URL_TEMPLATE.format(title_id=title.id)
+        get_with_queries(client, url)
+        key = get_count_key(Review, title_id=title.id)
+        with transaction.atomic():
+            Review.objects.create(title=title, author=user, text='b', score=5)
+            assert cache.get(key) == 1, (
+                'Проверьте, что количество сбрасывается только после '
+                'фиксации транзакции.'
+            )
+        assert cache.get(key) is None
+        data, _ = get_with_queries(client, url)
+        assert data['count'] == 2
@@ -0,0 +1,107 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import transaction
+
+from api.v1.cache import get_version
+from reviews.models import Category, Genre, Review, Title
+from tests.utils import capture_queries
+
+
+def get_with_queries(client, url):
+    response, queries = capture_queries(client, url)
+    assert response.status_code == HTTPStatus.OK
+    return response, len(queries)
+
+
+@pytest.mark.django_db(transaction=True)
+class Test12ResponseCache:
+
+    TITLES_URL = '/api/v1/titles/'
+    TITLES_DETAIL_URL_TEMPLATE = '/api/v1/titles/{title_id}/'
+    GENRES_URL = '/api/v1/genres/'
+
+    def check_cache(self, client, url):
+        response, _ = get_with_queries(client, url)
+        assert response['X-Cache'] == 'MISS'
+        response, queries = get_with_queries(client, url)
+        assert response['X-Cache'] == 'HIT' and queries == 0, (
+            f'Проверьте, что повторный GET-запрос к `{url}` отдаётся из кэша '
+            'без запросов к БД.'
+        )
+        return response.json()
+
+    def test_01_titles_cached_and_invalidated(self, client, admin):
+        genre = Genre.objects.create(name='Ужасы', slug='horror')
+        title = Title.objects.create(name='Терминатор', year=1984)
+        title.genre.set([genre])
+        detail_url = self.TITLES_DETAIL_URL_TEMPLATE.format(title_id=title.id)
+
+        assert self.check_cache(client, detail_url)['rating'] is None
+        self.check_cache(client, self.TITLES_URL)
+
+        Review.objects.create(title=title, author=admin, text='a', score=8)
+        response, _ = get_with_queries(client, detail_url)
+        assert response.json()['rating'] == 8, (
+            'Проверьте, что кэш произведений сбрасывается при создании '
+            'отзыва, меняющего рейтинг.'
+        )
+
+        genre.name = 'Хоррор'
+        genre.save()
+        response, _ = get_with_queries(client, self.TITLES_URL)
+        assert response.json()['results'][0]['genre'][0]['name'] == 'Хоррор', (
+            'Проверьте, что кэш произведений сбрасывается при изменении жанра.'
+        )
+        response, _ = get_with_queries(client, self.GENRES_URL)
+        assert response['X-Cache'] == 'MISS'
+
+        title.category = Category.objects.create(name='Фильм', slug='films')
+        title.save()
+        response, _ = get_with_queries(client, detail_url)
+        assert response.json()['category']['slug'] == 'films'
+
+    def test_02_query_string_normalized(self, client):
+        Title.objects.create(name='Терминатор', year=1984)
+        get_with_queries(client, f'{self.TITLES_URL}?year=1984&name=Терм')
+        response, _ = get_with_queries(
+            client, f'{self.TITLES_URL}?name=Терм&year=1984'
+        )
+        assert response['X-Cache'] == 'HIT', (
+            'Проверьте, что ключ кэша не зависит от порядка параметров запроса.'
+        )
+
+    def test_03_file_based_cache(self, client, settings, tmp_path):
+        settings.CACHES = {
+            'default': {
+                'BACKEND':
+                    'django.core.cache.backends.filebased.FileBasedCache',
+                'LOCATION': str(tmp_path),
+            }
+        }
+        Genre.objects.create(name='Ужасы', slug='horror')
+        self.check_cache(client, self.GENRES_URL)
+        Genre.objects.create(name='Комедия', slug='comedy')
+        response, _ = get_with_queries(client, self.GENRES_URL)
+        assert response.json()['count'] == 2
+
+    def test_04_versions_bumped_after_commit(self, client, admin):
+        title = Title.objects.create(name='Терминатор', year=1984)
+        versions = {
+            name: get_version(name)
+            for name in ('genres', 'titles', f'reviews:title:{title.id}')
+        }
+        with transaction.atomic():
+            Genre.objects.create(name='Ужасы', slug='horror')
+            Review.objects.create(
+                title=title, author=admin, text='a', score=5
+            )
+            assert {
+                name: get_version(name) for name in versions
+            } == versions, (
+                'Проверьте, что версии кэша повышаются только после '
+                'фиксации транзакции: иначе параллельный запрос закэширует '
+                'старые данные под новой версией.'
+            )
+        for name, version in versions.items():
+            assert get_version(name) > version
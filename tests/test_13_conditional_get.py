@@ -0,0 +1,121 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from reviews.models import Comment, Review, Title
+
+
+@pytest.mark.django_db(transaction=True)
+class Test13ConditionalGet:
+
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+    COMMENTS_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/comments/'
+    )
+
+    def test_01_reviews_not_modified(self, client, admin, user):
+        title = Title.objects.create(name='Терминатор', year=1984)
+        review = Review.objects.create(
+            title=title, author=admin, text='a', score=5
+        )
+        url = self.REVIEWS_URL_TEMPLATE.format(title_id=title.id)
+
+        response = client.get(url)
+        assert response.status_code == HTTPStatus.OK
+        etag = response['ETag']
+        assert etag and response['Last-Modified'], (
+            f'Проверьте, что ответ на GET-запрос к `{url}` содержит '
+            'заголовки `ETag` и `Last-Modified`.'
+        )
+
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.NOT_MODIFIED, (
+            f'Проверьте, что GET-запрос к `{url}` с актуальным '
+            '`If-None-Match` возвращает ответ со статусом 304.'
+        )
+        assert len(context) == 0, (
+            'Проверьте, что ответ 304 отдаётся без запросов к БД.'
+        )
+
+        response = client.get(
+            url, HTTP_IF_MODIFIED_SINCE=client.get(url)['Last-Modified']
+        )
+        assert response.status_code == HTTPStatus.NOT_MODIFIED
+
+        review.text = 'b'
+        review.save()
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что после изменения отзыва ETag списка отзывов '
+            'меняется.'
+        )
+        assert response.json()['results'][0]['text'] == 'b'
+
+    def test_02_comments_not_modified(self, client, admin):
+        title = Title.objects.create(name='Терминатор', year=1984)
+        review = Review.objects.create(
+            title=title, author=admin, text='a', score=5
+        )
+        url = self.COMMENTS_URL_TEMPLATE.format(
+            title_id=title.id, review_id=review.id
+        )
+        etag = client.get(url)['ETag']
+        assert client.get(
+            url, HTTP_IF_NONE_MATCH=etag
+        ).status_code == HTTPStatus.NOT_MODIFIED
+
+        Comment.objects.create(review=review, author=admin, text='c')
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что после добавления комментария ETag списка '
+            'комментариев меняется.'
+        )
+        assert response.json()['count'] == 1
+
+    def test_03_last_modified_within_one_second(self, client, admin):
+        title = Title.objects.create(name='Терминатор', year=1984)
+        review = Review.objects.create(
+            title=title, author=admin, text='a', score=5
+        )
+        url = self.REVIEWS_URL_TEMPLATE.format(title_id=title.id)
+        last_modified = client.get(url)['Last-Modified']
+        for text in ('b', 'c'):
+            review.text = text
+            review.save()
+            response = client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified)
+            assert response.status_code == HTTPStatus.OK, (
+                'Проверьте, что `Last-Modified` меняется при каждом '
+                'изменении данных, даже в пределах одной секунды.'
+            )
+            assert response.json()['results'][0]['text'] == text
+            last_modified = response['Last-Modified']
+
+    def test_04_author_rename_changes_etag(self, client, admin, user):
+        title = Title.objects.create(name='Терминатор', year=1984)
+        review = Review.objects.create(
+            title=title, author=admin, text='a', score=5
+        )
+        Comment.objects.create(review=review, author=user, text='b')
+        reviews_url = self.REVIEWS_URL_TEMPLATE.format(title_id=title.id)
+        urls = (
+            reviews_url,
+            reviews_url + '?expand=comments',
+            self.COMMENTS_URL_TEMPLATE.format(
+                title_id=title.id, review_id=review.id
+            ),
+        )
+        etags = {url: client.get(url)['ETag'] for url in urls}
+
+        user = type(user).objects.get(pk=user.pk)
+        user.username = 'renamed'
+        user.save()
+        for url, etag in etags.items():
+            response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+            assert response.status_code == HTTPStatus.OK, (
+                'Проверьте, что после смены имени пользователя ETag списков '
+                f'с его отзывами и комментариями меняется: `{url}`.'
+            )
+        assert response.json()['results'][0]['author'] == 'renamed'
@@ -0,0 +1,57 @@
+from http import HTTPStatus
+
+import pytest
+
+from reviews.models import Title
+
+
+@pytest.mark.django_db(transaction=True)
+class Test14TitleSearch:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    def search(self, client, query):
+        response = client.get(self.TITLES_URL, {'search': query})
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что GET-запрос к `{self.TITLES_URL}` с параметром '
+            '`search` возвращает ответ со статусом 200.'
+        )
+        return [title['name'] for title in response.json()['results']]
+
+    def test_01_search_name_and_description(self, client):
+        Title.objects.create(
+            name='Терминатор', year=1984, description='Робот из будущего'
+        )
+        Title.objects.create(
+            name='Крепкий орешек', year=1988, description='Полицейский боевик'
+        )
+        Title.objects.create(
+            name='Робокоп', year=1987, description='Полицейский робот'
+        )
+
+        assert self.search(client, 'терминатор') == ['Терминатор']
+        assert sorted(self.search(client, 'полицейский')) == [
+            'Крепкий орешек', 'Робокоп'
+        ]
+        assert self.search(client, 'полицейский робот') == ['Робокоп'], (
+            'Проверьте, что поиск возвращает произведения, содержащие '
+            'все слова запроса.'
+        )
+        assert self.search(client, 'Робо') == ['Робокоп', 'Терминатор'], (
+            'Проверьте, что поиск учитывает префиксы слов и ранжирует '
+            'совпадения в названии выше совпадений в описании.'
+        )
+        assert self.search(client, '"*)(') == []
+
+    def test_02_search_index_follows_changes(self, client):
+        title = Title.objects.create(name='Терминатор', year=1984)
+        title.name = 'Чужой'
+        title.save()
+        assert self.search(client, 'терминатор') == []
+        assert self.search(client, 'чужой') == ['Чужой']
+
+        title.delete()
+        assert self.search(client, 'чужой') == [], (
+            'Проверьте, что поисковый индекс обновляется при удалении '
+            'произведения.'
+        )
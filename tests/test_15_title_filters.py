@@ -0,0 +1,100 @@
+from http import HTTPStatus
+
+import pytest
+
+from reviews.models import Category, Genre, Title
+
+
+@pytest.mark.django_db(transaction=True)
+class Test15TitleFilters:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    @pytest.fixture
+    def catalogue(self):
+        horror = Genre.objects.create(name='Ужасы', slug='horror')
+        comedy = Genre.objects.create(name='Комедия', slug='comedy')
+        Genre.objects.create(name='Комедия ужасов', slug='horror-comedy')
+        films = Category.objects.create(name='Фильм', slug='films')
+        Category.objects.create(name='Фильмы-концерты', slug='films-live')
+        scream = Title.objects.create(name='Крик', year=1996, category=films)
+        scream.genre.set([horror, comedy])
+        alien = Title.objects.create(name='Чужой', year=1979, category=films)
+        alien.genre.set([horror])
+        Title.objects.create(name='Маска', year=1994).genre.set([comedy])
+
+    def filter_names(self, client, params):
+        response = client.get(self.TITLES_URL, params)
+        assert response.status_code == HTTPStatus.OK
+        return [title['name'] for title in response.json()['results']]
+
+    def test_01_exact_genre_and_category(self, client, catalogue):
+        assert self.filter_names(client, {'genre': 'horror'}) == [
+            'Крик', 'Чужой'
+        ], (
+            'Проверьте, что фильтр `genre` сравнивает слаг жанра точно.'
+        )
+        assert self.filter_names(client, {'category': 'films'}) == [
+            'Крик', 'Чужой'
+        ]
+        assert self.filter_names(client, {'category': 'film'}) == []
+        assert self.filter_names(client, {'genre': 'unknown'}) == []
+
+    def test_02_multiple_genres(self, client, catalogue):
+        assert self.filter_names(client, {'genre': 'horror,comedy'}) == [
+            'Крик', 'Маска', 'Чужой'
+        ], (
+            'Проверьте, что фильтр `genre` с несколькими слагами возвращает '
+            'произведения хотя бы с одним из жанров без дубликатов.'
+        )
+        assert self.filter_names(
+            client, {'genre': 'horror,comedy', 'genre_match': 'all'}
+        ) == ['Крик'], (
+            'Проверьте, что `genre_match=all` возвращает произведения '
+            'со всеми перечисленными жанрами.'
+        )
+        assert self.filter_names(
+            client, {'genre': 'horror,unknown', 'genre_match': 'all'}
+        ) == []
+
+    def test_03_rating_ordering_and_range(self, client, django_user_model):
+        scores = {'Крик': (6, 8), 'Чужой': (9, 10), 'Маска': (3, 5)}
+        for name, title_scores in scores.items():
+            title = Title.objects.create(name=name, year=2000)
+            for idx, score in enumerate(title_scores):
+                author, _ = django_user_model.objects.get_or_create(
+                    username=f'critic{idx}', email=f'critic{idx}@yamdb.fake'
+                )
+                title.reviews.create(author=author, text='-', score=score)
+        Title.objects.create(name='Без отзывов', year=2000)
+
+        assert self.filter_names(client, {'ordering': '-rating'}) == [
+            'Чужой', 'Крик', 'Маска', 'Без отзывов'
+        ], (
+            'Проверьте, что `ordering=-rating` сортирует произведения по '
+            'убыванию рейтинга.'
+        )
+        assert self.filter_names(client, {'ordering': 'rating'})[1:] == [
+            'Маска', 'Крик', 'Чужой'
+        ]
+        assert self.filter_names(
+            client, {'rating_min': 5, 'rating_max': 8, 'ordering': 'rating'}
+        ) == ['Крик'], (
+            'Проверьте, что фильтры `rating_min` и `rating_max` отбирают '
+            'произведения по диапазону рейтинга.'
+        )
+
+    def test_04_ordering_with_cursor_pagination(self, client, catalogue):
+        for params in (
+            {'ordering': '-rating', 'pagination': 'cursor'},
+            {'ordering': 'year', 'cursor': 'e30='},
+        ):
+            response = client.get(self.TITLES_URL, params)
+            assert response.status_code == HTTPStatus.BAD_REQUEST, (
+                'Проверьте, что `ordering` вместе с курсорной пагинацией '
+                'отклоняется, а не игнорируется молча.'
+            )
+            assert 'ordering' in response.json()
+        assert self.filter_names(client, {'pagination': 'cursor'}) == [
+            'Крик', 'Маска', 'Чужой'
+        ]
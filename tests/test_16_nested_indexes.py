@@ -0,0 +1,36 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+from reviews.models import Title
+
+
+@pytest.mark.django_db(transaction=True)
+class Test16NestedIndexes:
+
+    def test_01_nested_lists_use_index_order(self, django_user_model):
+        title = Title.objects.create(name='Терминатор', year=1984)
+        for idx in range(20):
+            author = django_user_model.objects.create_user(
+                username=f'critic{idx}', email=f'critic{idx}@yamdb.fake'
+            )
+            review = title.reviews.create(author=author, text='-', score=5)
+            review.comments.create(author=author, text='-')
+
+        stdout, stderr = StringIO(), StringIO()
+        call_command(
+            'explain_nested_lists', repeat=1, stdout=stdout, stderr=stderr
+        )
+        assert 'порядок индекса' in stdout.getvalue()
+        assert 'есть сортировка' not in stdout.getvalue(), (
+            'Проверьте, что страницы отзывов и комментариев читаются '
+            'в порядке составного индекса без отдельной сортировки:\n'
+            f'{stdout.getvalue()}'
+        )
+        assert stderr.getvalue() == ''
+        for index in ('review_title_pub_date_idx', 'comment_review_pub_date_idx'):
+            assert index in stdout.getvalue(), (
+                f'Проверьте, что запросы списков API используют индекс '
+                f'`{index}`:\n{stdout.getvalue()}'
+            )
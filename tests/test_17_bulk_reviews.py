@@ -0,0 +1,108 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from reviews.models import Review, Title
+
+
+@pytest.mark.django_db(transaction=True)
+class Test17BulkReviews:
+
+    BULK_URL = '/api/v1/reviews/bulk/'
+    TITLES_DETAIL_URL_TEMPLATE = '/api/v1/titles/{title_id}/'
+
+    def test_01_bulk_create_and_errors(self, client, user_client, user):
+        terminator = Title.objects.create(name='Терминатор', year=1984)
+        alien = Title.objects.create(name='Чужой', year=1979)
+        mask = Title.objects.create(name='Маска', year=1994)
+        Review.objects.create(title=mask, author=user, text='-', score=3)
+        # Рейтинг попадает в кэш ответов до загрузки.
+        client.get(self.TITLES_DETAIL_URL_TEMPLATE.format(
+            title_id=terminator.id
+        ))
+        data = [
+            {'title': terminator.id, 'text': 'Классика', 'score': 9},
+            {'title': alien.id, 'text': 'Страшно', 'score': 8},
+            {'title': terminator.id, 'text': 'Повтор', 'score': 1},
+            {'title': mask.id, 'text': 'Уже есть', 'score': 5},
+            {'title': alien.id + mask.id, 'text': 'Нет такого', 'score': 5},
+            {'title': alien.id, 'text': 'Без оценки'},
+        ]
+
+        response = user_client.post(self.BULK_URL, data=data, format='json')
+        assert response.status_code == HTTPStatus.CREATED, (
+            f'Проверьте, что POST-запрос к `{self.BULK_URL}` с корректными '
+            'отзывами возвращает ответ со статусом 201.'
+        )
+        created = response.json()['created']
+        assert [(item['title'], item['score']) for item in created] == [
+            (terminator.id, 9), (alien.id, 8)
+        ]
+        assert all(item['author'] == user.username for item in created)
+        assert [item['index'] for item in response.json()['errors']] == [
+            2, 3, 4, 5
+        ], (
+            'Проверьте, что ответ содержит ошибки по индексам отзывов: '
+            'повтор в пачке, существующий отзыв, несуществующее '
+            'произведение и невалидные данные.'
+        )
+        assert Review.objects.count() == 3
+
+        response = client.get(self.TITLES_DETAIL_URL_TEMPLATE.format(
+            title_id=terminator.id
+        ))
+        assert response.json()['rating'] == 9, (
+            'Проверьте, что массовая загрузка обновляет рейтинг '
+            'произведений и сбрасывает кэш ответов.'
+        )
+        response = client.get(
+            f'/api/v1/titles/{alien.id}/reviews/'
+        )
+        assert response.json()['count'] == 1
+
+    def test_02_bulk_query_count(self, user_client, user):
+        titles = [
+            Title.objects.create(name=f'Произведение {idx}', year=2000)
+            for idx in range(20)
+        ]
+        data = [
+            {'title': title.id, 'text': '-', 'score': 7} for title in titles
+        ]
+        with CaptureQueriesContext(connection) as context:
+            response = user_client.post(
+                self.BULK_URL, data=data, format='json'
+            )
+        assert response.status_code == HTTPStatus.CREATED
+        assert len(response.json()['created']) == len(titles)
+        inserts = [
+            query for query in context.captured_queries
+            if query['sql'].startswith('INSERT INTO "reviews_review"')
+        ]
+        assert len(inserts) == 1, (
+            'Проверьте, что отзывы сохраняются одним запросом bulk_create.'
+        )
+        assert len(context) <= len(titles) + 7, (
+            'Проверьте, что проверки массовой загрузки выполняются '
+            'запросами на всю пачку, а не на каждый отзыв.'
+        )
+        assert set(Title.objects.values_list('rating', flat=True)) == {7}
+
+    def test_03_bulk_validation(self, client, user_client):
+        assert client.post(
+            self.BULK_URL, data=[], content_type='application/json'
+        ).status_code == HTTPStatus.UNAUTHORIZED
+        for data in ([], {'title': 1}):
+            response = user_client.post(
+                self.BULK_URL, data=data, format='json'
+            )
+            assert response.status_code == HTTPStatus.BAD_REQUEST
+        response = user_client.post(
+            self.BULK_URL, data=[{'title': 1, 'text': '-', 'score': 5}],
+            format='json'
+        )
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            'Проверьте, что запрос без созданных отзывов возвращает ответ '
+            'со статусом 400.'
+        )
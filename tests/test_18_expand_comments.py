@@ -0,0 +1,78 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from reviews.models import Comment, Title
+
+
+@pytest.mark.django_db(transaction=True)
+class Test18ExpandComments:
+
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+
+    @pytest.fixture
+    def title(self, django_user_model):
+        title = Title.objects.create(name='Терминатор', year=1984)
+        authors = [
+            django_user_model.objects.create_user(
+                username=f'critic{idx}', email=f'critic{idx}@yamdb.fake'
+            )
+            for idx in range(10)
+        ]
+        for idx, author in enumerate(authors):
+            review = title.reviews.create(author=author, text='-', score=5)
+            for number in range(idx % 5):
+                review.comments.create(author=author, text=str(number))
+        return title
+
+    def test_01_expanded_list(self, client, title):
+        url = self.REVIEWS_URL_TEMPLATE.format(title_id=title.id)
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(url, {'expand': 'comments'})
+        assert response.status_code == HTTPStatus.OK
+        assert len(context) <= 3, (
+            'Проверьте, что последние комментарии всех отзывов страницы '
+            'загружаются одним запросом.'
+        )
+        for review in response.json()['results']:
+            expected = list(Comment.objects.filter(
+                review_id=review['id']
+            ).order_by('-pub_date', 'id').values_list('text', flat=True)[:3])
+            assert [
+                comment['text'] for comment in review['comments']
+            ] == expected, (
+                'Проверьте, что `expand=comments` вкладывает в отзыв '
+                'не более 3 последних комментариев.'
+            )
+
+        response = client.get(url, {'expand': 'comments', 'comments_limit': 1})
+        assert max(
+            len(review['comments']) for review in response.json()['results']
+        ) == 1
+        assert 'comments' not in client.get(url).json()['results'][0]
+        response = client.get(url, {'expand': 'comments', 'comments_limit': 0})
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+
+    def test_02_expanded_detail_and_etag(self, client, admin, title):
+        review = title.reviews.order_by('id').last()
+        url = self.REVIEWS_URL_TEMPLATE.format(title_id=title.id)
+        detail_url = f'{url}{review.id}/'
+        response = client.get(detail_url, {'expand': 'comments'})
+        assert response.status_code == HTTPStatus.OK
+        assert len(response.json()['comments']) == 3
+
+        etag = client.get(url, {'expand': 'comments'})['ETag']
+        review.comments.create(author=admin, text='Новый')
+        response = client.get(
+            url, {'expand': 'comments'}, HTTP_IF_NONE_MATCH=etag
+        )
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что новый комментарий меняет ETag списка отзывов '
+            'с вложенными комментариями.'
+        )
+        expanded = {
+            item['id']: item for item in response.json()['results']
+        }[review.id]
+        assert expanded['comments'][0]['text'] == 'Новый'
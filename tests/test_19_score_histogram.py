@@ -0,0 +1,97 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from api_yamdb.settings import MAX_SCORE, MIN_SCORE
+from reviews.models import Title, TitleScoreCount
+
+
+@pytest.mark.django_db(transaction=True)
+class Test19ScoreHistogram:
+
+    HISTOGRAM_URL_TEMPLATE = '/api/v1/titles/{title_id}/score-histogram/'
+
+    def get_histogram(self, client, title):
+        url = self.HISTOGRAM_URL_TEMPLATE.format(title_id=title.id)
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(url)
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что GET-запрос к `{url}` возвращает ответ '
+            'со статусом 200.'
+        )
+        assert len(context) == 1, (
+            'Проверьте, что распределение оценок читается одним запросом '
+            'к счётчикам без группировки отзывов.'
+        )
+        data = response.json()
+        return {
+            item['score']: item['count'] for item in data['scores']
+        }, data['count'], data['rating']
+
+    def test_01_histogram_follows_reviews(self, client, django_user_model):
+        title = Title.objects.create(name='Терминатор', year=1984)
+        other = Title.objects.create(name='Чужой', year=1979)
+        authors = [
+            django_user_model.objects.create_user(
+                username=f'critic{idx}', email=f'critic{idx}@yamdb.fake'
+            )
+            for idx in range(3)
+        ]
+        reviews = [
+            title.reviews.create(author=author, text='-', score=score)
+            for author, score in zip(authors, (8, 8, 5))
+        ]
+
+        scores, count, rating = self.get_histogram(client, title)
+        assert list(scores) == list(range(MIN_SCORE, MAX_SCORE + 1))
+        assert (scores[8], scores[5], count, rating) == (2, 1, 3, 7), (
+            'Проверьте, что счётчики оценок обновляются при создании отзыва.'
+        )
+
+        reviews[0].score = 5
+        reviews[0].save()
+        reviews[1].title = other
+        reviews[1].save()
+        reviews[2].delete()
+        scores, count, rating = self.get_histogram(client, title)
+        assert (scores[8], scores[5], count, rating) == (0, 1, 1, 5), (
+            'Проверьте, что счётчики оценок обновляются при изменении '
+            'и удалении отзыва.'
+        )
+        assert self.get_histogram(client, other)[0][8] == 1
+
+        TitleScoreCount.objects.all().delete()
+        call_command('recalculate_ratings')
+        assert self.get_histogram(client, title)[1:] == (1, 5)
+
+    def test_02_empty_and_missing_title(self, client):
+        title = Title.objects.create(name='Терминатор', year=1984)
+        url = self.HISTOGRAM_URL_TEMPLATE.format(title_id=title.id)
+        response = client.get(url)
+        assert response.status_code == HTTPStatus.OK
+        assert (response.json()['count'], response.json()['rating']) == (
+            0, None
+        )
+        response = client.get(
+            self.HISTOGRAM_URL_TEMPLATE.format(title_id=title.id + 1)
+        )
+        assert response.status_code == HTTPStatus.NOT_FOUND
+
+    def test_03_bulk_reviews_update_histogram(self, user_client):
+        titles = [
+            Title.objects.create(name=name, year=2000)
+            for name in ('Крик', 'Маска')
+        ]
+        response = user_client.post('/api/v1/reviews/bulk/', data=[
+            {'title': title.id, 'text': '-', 'score': 6} for title in titles
+        ], format='json')
+        assert response.status_code == HTTPStatus.CREATED
+        assert set(TitleScoreCount.objects.values_list(
+            'title_id', 'score', 'count'
+        )) == {(title.id, 6, 1) for title in titles}, (
+            'Проверьте, что массовая загрузка отзывов обновляет счётчики '
+            'оценок.'
+        )
@@ -0,0 +1,119 @@
+import json
+from datetime import timedelta
+from http import HTTPStatus
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from api.v1 import export
+from reviews.models import Review, Title
+
+
+@pytest.mark.django_db(transaction=True)
+class Test20ReviewExport:
+
+    EXPORT_URL = '/api/v1/reviews/export/'
+    TITLE_EXPORT_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/export/'
+
+    @pytest.fixture
+    def titles(self, django_user_model):
+        titles = [
+            Title.objects.create(name=name, year=2000)
+            for name in ('Крик', 'Маска')
+        ]
+        for idx in range(5):
+            author = django_user_model.objects.create_user(
+                username=f'critic{idx}', email=f'critic{idx}@yamdb.fake'
+            )
+            for title in titles:
+                review = title.reviews.create(
+                    author=author, text=f'{title.name} {idx}', score=5
+                )
+                review.comments.create(author=author, text=str(idx))
+        return titles
+
+    def read_lines(self, response):
+        assert response.status_code == HTTPStatus.OK
+        assert response['Content-Type'] == export.NDJSON_CONTENT_TYPE
+        assert response.streaming, (
+            'Проверьте, что выгрузка отдаётся потоковым ответом.'
+        )
+        return [
+            json.loads(line)
+            for line in b''.join(response.streaming_content).splitlines()
+        ]
+
+    def test_01_export_all_and_by_title(self, admin_client, titles):
+        lines = self.read_lines(admin_client.get(self.EXPORT_URL))
+        assert len(lines) == 10
+        assert [line['id'] for line in lines] == list(
+            Review.objects.order_by('pub_date', 'id').values_list(
+                'id', flat=True
+            )
+        ), 'Проверьте, что отзывы выгружаются в порядке публикации.'
+        assert 'comments' not in lines[0]
+
+        url = self.TITLE_EXPORT_URL_TEMPLATE.format(title_id=titles[0].id)
+        lines = self.read_lines(
+            admin_client.get(url, {'expand': 'comments'})
+        )
+        assert {line['title'] for line in lines} == {titles[0].id}
+        assert all(len(line['comments']) == 1 for line in lines), (
+            'Проверьте, что `expand=comments` вкладывает комментарии '
+            'в выгружаемые отзывы.'
+        )
+        response = admin_client.get(
+            self.TITLE_EXPORT_URL_TEMPLATE.format(title_id=titles[1].id + 1)
+        )
+        assert response.status_code == HTTPStatus.NOT_FOUND
+
+    def test_02_since_filter(self, admin_client, titles):
+        review = Review.objects.order_by('id').first()
+        Review.objects.exclude(pk=review.pk).update(
+            pub_date=timezone.now() - timedelta(days=10)
+        )
+        since = (timezone.now() - timedelta(days=1)).isoformat()
+        lines = self.read_lines(
+            admin_client.get(self.EXPORT_URL, {'since': since})
+        )
+        assert [line['id'] for line in lines] == [review.id], (
+            'Проверьте, что параметр `since` отбирает отзывы, '
+            'опубликованные не раньше указанного времени.'
+        )
+        assert len(self.read_lines(admin_client.get(
+            self.EXPORT_URL, {'since': '2000-01-01'}
+        ))) == 10
+        response = admin_client.get(self.EXPORT_URL, {'since': 'вчера'})
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+
+    def test_03_chunked_queries(self, titles):
+        with CaptureQueriesContext(connection) as context:
+            lines = list(export.iter_reviews_ndjson(
+                Review.objects.all(), with_comments=True, chunk_size=3
+            ))
+        assert len(lines) == 10
+        assert len(context) <= 1 + 4, (
+            'Проверьте, что комментарии выгружаются одним запросом '
+            'на пачку отзывов.'
+        )
+
+    def test_04_permissions_and_command(self, client, user_client, titles):
+        assert client.get(
+            self.EXPORT_URL
+        ).status_code == HTTPStatus.UNAUTHORIZED
+        assert user_client.get(
+            self.EXPORT_URL
+        ).status_code == HTTPStatus.FORBIDDEN, (
+            'Проверьте, что выгрузка отзывов доступна только администратору.'
+        )
+        stdout = StringIO()
+        call_command(
+            'export_reviews', title=titles[0].id, comments=True, stdout=stdout
+        )
+        lines = stdout.getvalue().splitlines()
+        assert len(lines) == 5
+        assert json.loads(lines[0])['comments']
@@ -0,0 +1,147 @@
+import re
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from reviews.models import Comment, Review, Title, TitleScoreCount
+
+
+@pytest.mark.django_db(transaction=True)
+class Test21Moderation:
+
+    MODERATION_URL = '/api/v1/moderation/'
+    TITLES_DETAIL_URL_TEMPLATE = '/api/v1/titles/{title_id}/'
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+    COMMENTS_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/comments/'
+    )
+
+    @pytest.fixture
+    def titles(self, django_user_model):
+        titles = [
+            Title.objects.create(name=name, year=2000)
+            for name in ('Крик', 'Маска', 'Чужой')
+        ]
+        spammer = django_user_model.objects.create_user(
+            username='spammer', email='spammer@yamdb.fake'
+        )
+        critic = django_user_model.objects.create_user(
+            username='critic', email='critic@yamdb.fake'
+        )
+        for title in titles:
+            spam = title.reviews.create(author=spammer, text='спам', score=1)
+            spam.comments.create(author=critic, text='-')
+            review = title.reviews.create(author=critic, text='-', score=9)
+            review.comments.create(author=spammer, text='спам')
+        return titles
+
+    def test_01_delete_by_author(self, client, moderator_client, titles):
+        url = self.TITLES_DETAIL_URL_TEMPLATE.format(title_id=titles[0].id)
+        assert client.get(url).json()['rating'] == 5
+        client.get(self.REVIEWS_URL_TEMPLATE.format(title_id=titles[0].id))
+
+        with CaptureQueriesContext(connection) as context:
+            response = moderator_client.post(self.MODERATION_URL, data={
+                'action': 'delete', 'target': 'reviews', 'author': 'spammer'
+            }, format='json')
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что POST-запрос модератора к `{self.MODERATION_URL}` '
+            'возвращает ответ со статусом 200.'
+        )
+        assert response.json() == {
+            'action': 'delete',
+            'target': 'reviews',
+            'affected': 3,
+            'titles': sorted(title.id for title in titles),
+            'deleted': {'reviews': 3, 'comments': 3},
+        }
+        assert len(context) <= 15, (
+            'Проверьте, что массовая модерация выполняется запросами на все '
+            'объекты сразу, а не на каждый объект.'
+        )
+        assert not Review.objects.filter(author__username='spammer').exists()
+        assert client.get(url).json()['rating'] == 9, (
+            'Проверьте, что после массового удаления рейтинг произведений '
+            'пересчитывается и кэш ответов сбрасывается.'
+        )
+        assert set(TitleScoreCount.objects.values_list('score', 'count')) == {
+            (9, 1)
+        }
+        response = client.get(
+            self.REVIEWS_URL_TEMPLATE.format(title_id=titles[0].id)
+        )
+        assert response.json()['count'] == 1
+
+    def test_02_replace_comment_text(self, moderator_client, titles):
+        comment_ids = list(Comment.objects.filter(
+            author__username='spammer'
+        ).values_list('id', flat=True))
+        response = moderator_client.post(self.MODERATION_URL, data={
+            'action': 'replace_text', 'target': 'comments',
+            'ids': comment_ids[:2], 'text': 'Удалено модератором',
+        }, format='json')
+        assert response.status_code == HTTPStatus.OK
+        assert response.json()['affected'] == 2
+        assert Comment.objects.filter(
+            text='Удалено модератором'
+        ).count() == 2
+
+    def test_03_validation_and_permissions(self, user_client, admin_client,
+                                           titles):
+        data = {'action': 'delete', 'target': 'comments', 'ids': [1]}
+        assert user_client.post(
+            self.MODERATION_URL, data=data, format='json'
+        ).status_code == HTTPStatus.FORBIDDEN, (
+            'Проверьте, что массовая модерация недоступна обычному '
+            'пользователю.'
+        )
+        for invalid in (
+            {'action': 'delete', 'target': 'comments'},
+            {'action': 'replace_text', 'target': 'reviews', 'ids': [1]},
+            {'action': 'ban', 'target': 'reviews', 'ids': [1]},
+        ):
+            response = admin_client.post(
+                self.MODERATION_URL, data=invalid, format='json'
+            )
+            assert response.status_code == HTTPStatus.BAD_REQUEST
+        response = admin_client.post(self.MODERATION_URL, data={
+            'action': 'delete', 'target': 'comments', 'author': 'nobody'
+        }, format='json')
+        assert response.json()['affected'] == 0
+
+    def test_04_delete_by_author_is_set_based(self, client, moderator_client,
+                                              titles):
+        spammer = Review.objects.filter(author__username='spammer')[0].author
+        for number in range(40):
+            title = Title.objects.create(name=f'Спам {number}', year=2000)
+            title.reviews.create(author=spammer, text='спам', score=1)
+        review = titles[0].reviews.get(author=spammer)
+        comments_url = self.COMMENTS_URL_TEMPLATE.format(
+            title_id=titles[0].id, review_id=review.id
+        )
+        assert client.get(comments_url).status_code == HTTPStatus.OK
+
+        with CaptureQueriesContext(connection) as context:
+            response = moderator_client.post(self.MODERATION_URL, data={
+                'action': 'delete', 'target': 'reviews', 'author': 'spammer'
+            }, format='json')
+        assert response.json()['deleted'] == {'reviews': 43, 'comments': 3}
+        assert len(context) <= 15, (
+            'Проверьте, что число запросов массовой модерации не зависит '
+            'от числа затронутых объектов.'
+        )
+        id_lists = [
+            query['sql'] for query in context.captured_queries
+            if re.match(r'(DELETE FROM|UPDATE) "reviews_(review|comment)"',
+                        query['sql'])
+            and re.search(r'IN \(\d+, \d+', query['sql'])
+        ]
+        assert not id_lists, (
+            'Проверьте, что отзывы выбираются подзапросом, а не списком id.'
+        )
+        assert client.get(comments_url).status_code == HTTPStatus.NOT_FOUND, (
+            'Проверьте, что после массового удаления отзывов кэш списков '
+            'их комментариев сбрасывается.'
+        )
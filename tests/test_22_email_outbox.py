@@ -0,0 +1,161 @@
+from datetime import timedelta
+from http import HTTPStatus
+from io import StringIO
+
+import uuid
+
+import pytest
+from django.core import mail
+from django.core.mail.backends.locmem import EmailBackend
+from django.core.management import call_command
+from django.db import connection
+from django.utils import timezone
+
+from users.models import OutgoingEmail
+from users.outbox import enqueue_email, send_outbox, send_outbox_batch
+
+
+class CountingBackend(EmailBackend):
+    opened = 0
+
+    def open(self):
+        CountingBackend.opened += 1
+        return super().open()
+
+
+class FailingBackend(EmailBackend):
+
+    def send_messages(self, messages):
+        raise ConnectionError('SMTP недоступен')
+
+
+class ConcurrentBackend(EmailBackend):
+    observed = []
+
+    def send_messages(self, messages):
+        ConcurrentBackend.observed.append((
+            connection.in_atomic_block,
+            send_outbox_batch(),
+            enqueue_email('Тема', 'Текст', 'new@yamdb.fake').id,
+        ))
+        return super().send_messages(messages)
+
+
+@pytest.mark.django_db(transaction=True)
+class Test22EmailOutbox:
+
+    URL_SIGNUP = '/api/v1/auth/signup/'
+
+    def test_01_signup_enqueues(self, client):
+        response = client.post(self.URL_SIGNUP, data={
+            'email': 'valid@yamdb.fake', 'username': 'valid_username'
+        })
+        assert response.status_code == HTTPStatus.OK
+        assert len(mail.outbox) == 0, (
+            'Проверьте, что регистрация не отправляет письмо в запросе, '
+            'а ставит его в очередь.'
+        )
+        email = OutgoingEmail.objects.get()
+        assert email.recipient == 'valid@yamdb.fake'
+
+        stdout = StringIO()
+        call_command('send_outbox', stdout=stdout)
+        assert 'Отправлено писем: 1' in stdout.getvalue()
+        assert mail.outbox[0].to == ['valid@yamdb.fake']
+        assert OutgoingEmail.objects.get().sent_at is not None
+        call_command('send_outbox', stdout=StringIO())
+        assert len(mail.outbox) == 1, (
+            'Проверьте, что отправленные письма не отправляются повторно.'
+        )
+
+    def test_02_batches_share_connection(self, settings):
+        settings.EMAIL_BACKEND = 'tests.test_22_email_outbox.CountingBackend'
+        CountingBackend.opened = 0
+        for idx in range(5):
+            enqueue_email('Тема', 'Текст', f'user{idx}@yamdb.fake')
+        assert send_outbox(batch_size=2) == (5, 0)
+        assert len(mail.outbox) == 5
+        assert CountingBackend.opened == 3, (
+            'Проверьте, что обработчик очереди открывает одно соединение '
+            'с почтой на пачку писем.'
+        )
+
+    def test_03_retries_with_backoff(self, settings):
+        settings.EMAIL_BACKEND = 'tests.test_22_email_outbox.FailingBackend'
+        email = enqueue_email('Тема', 'Текст', 'user@yamdb.fake')
+        assert send_outbox() == (0, 1)
+        email.refresh_from_db()
+        assert email.attempts == 1 and 'SMTP' in email.last_error
+        assert email.next_attempt_at > timezone.now(), (
+            'Проверьте, что неудачное письмо откладывается на следующую '
+            'попытку.'
+        )
+        first_delay = email.next_attempt_at - timezone.now()
+        assert send_outbox() == (0, 0)
+
+        OutgoingEmail.objects.update(next_attempt_at=timezone.now())
+        send_outbox()
+        email.refresh_from_db()
+        assert email.attempts == 2
+        assert email.next_attempt_at - timezone.now() > first_delay, (
+            'Проверьте, что задержка между попытками растёт.'
+        )
+
+        settings.EMAIL_BACKEND = (
+            'django.core.mail.backends.locmem.EmailBackend'
+        )
+        OutgoingEmail.objects.update(next_attempt_at=timezone.now())
+        assert send_outbox() == (1, 0)
+
+    def test_04_file_backend(self, settings, tmp_path):
+        settings.EMAIL_BACKEND = (
+            'django.core.mail.backends.filebased.EmailBackend'
+        )
+        settings.EMAIL_FILE_PATH = str(tmp_path)
+        enqueue_email('Тема', 'Проверочный код: 123', 'user@yamdb.fake')
+        OutgoingEmail.objects.update(
+            next_attempt_at=timezone.now() - timedelta(seconds=1)
+        )
+        assert send_outbox() == (1, 0)
+        files = list(tmp_path.iterdir())
+        assert len(files) == 1
+        assert 'To: user@yamdb.fake' in files[0].read_text(), (
+            'Проверьте, что обработчик очереди работает с файловым '
+            '`EMAIL_BACKEND`.'
+        )
+
+    def test_05_sends_outside_transaction(self, settings):
+        settings.EMAIL_BACKEND = (
+            'tests.test_22_email_outbox.ConcurrentBackend'
+        )
+        ConcurrentBackend.observed = []
+        email = enqueue_email('Тема', 'Текст', 'user@yamdb.fake')
+        assert send_outbox_batch() == (1, 0)
+        in_atomic_block, nested, _ = ConcurrentBackend.observed[0]
+        assert not in_atomic_block, (
+            'Проверьте, что письма отправляются вне транзакции БД.'
+        )
+        assert nested == (0, 0), (
+            'Проверьте, что письма, забранные обработчиком, не отправляет '
+            'параллельный обработчик.'
+        )
+        email.refresh_from_db()
+        assert email.sent_at is not None and email.claimed_by is None
+        assert OutgoingEmail.objects.filter(sent_at__isnull=True).count() == 1
+
+    def test_06_expired_lease_is_retried(self):
+        email = enqueue_email('Тема', 'Текст', 'user@yamdb.fake')
+        OutgoingEmail.objects.update(
+            claimed_by=uuid.uuid4(),
+            next_attempt_at=timezone.now() + timedelta(minutes=1),
+        )
+        assert send_outbox() == (0, 0)
+        OutgoingEmail.objects.update(
+            next_attempt_at=timezone.now() - timedelta(seconds=1)
+        )
+        assert send_outbox() == (1, 0), (
+            'Проверьте, что письма обработчика, не отметившего результат '
+            'за срок аренды, отправляются снова.'
+        )
+        email.refresh_from_db()
+        assert email.claimed_by is None
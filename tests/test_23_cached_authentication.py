@@ -0,0 +1,71 @@
+from http import HTTPStatus
+
+import pytest
+
+from api.v1.authentication import UserCache, user_cache
+from tests.utils import capture_queries
+
+
+def user_queries(client, url):
+    return capture_queries(client, url, match='FROM "users_user"')
+
+
+@pytest.mark.django_db(transaction=True)
+class Test23CachedAuthentication:
+
+    ME_URL = '/api/v1/users/me/'
+    CATEGORIES_URL = '/api/v1/categories/'
+
+    def test_01_user_loaded_once(self, user_client):
+        response, queries = user_queries(user_client, self.ME_URL)
+        assert response.status_code == HTTPStatus.OK
+        response, queries = user_queries(user_client, self.CATEGORIES_URL)
+        assert response.status_code == HTTPStatus.OK
+        assert not queries, (
+            'Проверьте, что повторный запрос с JWT-токеном берёт '
+            'пользователя из кэша без запроса к БД.'
+        )
+
+    def test_02_invalidated_on_role_change(self, admin_client, user_client,
+                                           user):
+        data = {'name': 'Фильм', 'slug': 'films'}
+        response = user_client.post(self.CATEGORIES_URL, data=data)
+        assert response.status_code == HTTPStatus.FORBIDDEN
+
+        response = admin_client.patch(
+            f'/api/v1/users/{user.username}/', data={'role': 'admin'}
+        )
+        assert response.status_code == HTTPStatus.OK
+        response = user_client.post(self.CATEGORIES_URL, data=data)
+        assert response.status_code == HTTPStatus.CREATED, (
+            'Проверьте, что кэш пользователей сбрасывается при изменении '
+            'пользователя.'
+        )
+
+        user.delete()
+        response = user_client.get(self.ME_URL)
+        assert response.status_code == HTTPStatus.UNAUTHORIZED
+
+    def test_03_ttl(self, user_client, monkeypatch):
+        monkeypatch.setattr(user_cache, 'ttl', 0)
+        user_queries(user_client, self.ME_URL)
+        _, queries = user_queries(user_client, self.CATEGORIES_URL)
+        assert len(queries) == 1, (
+            'Проверьте, что записи кэша пользователей устаревают '
+            'через AUTH_USER_CACHE_TTL секунд.'
+        )
+
+    def test_04_lru_and_copies(self, user, admin, moderator):
+        cache = UserCache(maxsize=2, ttl=60)
+        cache.set('1', user)
+        cache.set('2', admin)
+        assert cache.get('1').username == user.username
+        cache.set('3', moderator)
+        assert cache.get('2') is None, (
+            'Проверьте, что кэш пользователей вытесняет давно '
+            'не использованные записи.'
+        )
+        cached = cache.get('1')
+        cached.role = 'admin'
+        assert cache.get('1').role == user.role
+        assert cache.get('1') is not cache.get('1')
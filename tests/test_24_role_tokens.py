@@ -0,0 +1,127 @@
+from http import HTTPStatus
+
+import pytest
+from django.conf import settings
+from django.contrib.auth.tokens import default_token_generator
+from django.core.cache.backends.filebased import FileBasedCache
+from django.db.models import F
+from rest_framework.test import APIClient
+
+from api.v1.authentication import RoleAccessToken, get_token_version_key
+from reviews.models import Title
+from tests.utils import capture_queries
+from users.models import User
+
+
+def get_client(user):
+    client = APIClient()
+    client.credentials(
+        HTTP_AUTHORIZATION=f'Bearer {RoleAccessToken.for_user(user)}'
+    )
+    return client
+
+
+def count_user_queries(client, url, method='get', data=None):
+    response, queries = capture_queries(
+        client, url, method, data, match='FROM "users_user"', format='json'
+    )
+    return response, len(queries)
+
+
+@pytest.mark.django_db(transaction=True)
+class Test24RoleTokens:
+
+    URL_TOKEN = '/api/v1/auth/token/'
+    CATEGORIES_URL = '/api/v1/categories/'
+
+    def test_01_token_claims(self, client, user):
+        response = client.post(self.URL_TOKEN, data={
+            'username': user.username,
+            'confirmation_code': default_token_generator.make_token(user),
+        })
+        assert response.status_code == HTTPStatus.OK
+        token = RoleAccessToken(response.json()['token'])
+        assert (
+            token['role'], token['is_superuser'], token['token_version']
+        ) == (user.role, False, 0), (
+            f'Проверьте, что токен от `{self.URL_TOKEN}` содержит роль, '
+            'признак суперпользователя и версию токенов.'
+        )
+
+    def test_02_permissions_without_user_lookup(self, admin, user):
+        admin_client = get_client(admin)
+        count_user_queries(admin_client, self.CATEGORIES_URL)
+        response, queries = count_user_queries(
+            admin_client, self.CATEGORIES_URL, 'post',
+            {'name': 'Фильм', 'slug': 'films'}
+        )
+        assert response.status_code == HTTPStatus.CREATED
+        assert queries == 0, (
+            'Проверьте, что права администратора проверяются по '
+            'утверждениям токена без запроса пользователя к БД.'
+        )
+        response, queries = count_user_queries(
+            get_client(user), self.CATEGORIES_URL, 'post',
+            {'name': 'Книга', 'slug': 'books'}
+        )
+        assert response.status_code == HTTPStatus.FORBIDDEN
+
+    def test_03_role_change_revokes_tokens(self, admin_client, user):
+        user_client = get_client(user)
+        assert user_client.get('/api/v1/users/me/').json()['role'] == 'user'
+        response = admin_client.patch(
+            f'/api/v1/users/{user.username}/', data={'role': 'moderator'}
+        )
+        assert response.status_code == HTTPStatus.OK
+        response = user_client.get('/api/v1/users/me/')
+        assert response.status_code == HTTPStatus.UNAUTHORIZED, (
+            'Проверьте, что изменение роли отзывает выданные токены.'
+        )
+        user.refresh_from_db()
+        response = get_client(user).get('/api/v1/users/me/')
+        assert response.json()['role'] == 'moderator'
+
+        user.bio = 'Критик'
+        user.save()
+        assert get_client(user).get(
+            '/api/v1/users/me/'
+        ).status_code == HTTPStatus.OK
+
+    def test_04_token_user_writes(self, user):
+        title = Title.objects.create(name='Терминатор', year=1984)
+        client = get_client(user)
+        url = f'/api/v1/titles/{title.id}/reviews/'
+        response = client.post(url, data={'text': 'Классика', 'score': 9})
+        assert response.status_code == HTTPStatus.CREATED
+        assert response.json()['author'] == user.username
+        review_id = response.json()['id']
+        response = client.post(
+            f'{url}{review_id}/comments/', data={'text': 'Да'}
+        )
+        assert response.status_code == HTTPStatus.CREATED
+        response = client.patch(f'{url}{review_id}/', data={'text': 'Шедевр'})
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что автор с токеном с ролью может изменять свой '
+            'отзыв.'
+        )
+
+    def test_05_revocation_shared_between_processes(self, user):
+        user_client = get_client(user)
+        assert user_client.get(
+            '/api/v1/users/me/'
+        ).status_code == HTTPStatus.OK
+
+        # Другой процесс меняет права пользователя и сбрасывает версию
+        # токенов в своём экземпляре общего кэша.
+        User.objects.filter(pk=user.pk).update(
+            token_version=F('token_version') + 1
+        )
+        other_process_cache = FileBasedCache(
+            settings.CACHES['tokens']['LOCATION'], {}
+        )
+        other_process_cache.delete(get_token_version_key(user.pk))
+        response = user_client.get('/api/v1/users/me/')
+        assert response.status_code == HTTPStatus.UNAUTHORIZED, (
+            'Проверьте, что версии токенов хранятся в общем для процессов '
+            'кэше и отзыв токенов в одном процессе виден остальным.'
+        )
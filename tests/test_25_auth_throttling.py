@@ -0,0 +1,121 @@
+from http import HTTPStatus
+from io import StringIO
+
+import pytest
+from django.core.cache import caches
+from django.core.cache.backends.filebased import FileBasedCache
+from django.core.management import call_command
+
+from api.v1 import throttling
+
+
+@pytest.mark.django_db(transaction=True)
+class Test25AuthThrottling:
+
+    URL_SIGNUP = '/api/v1/auth/signup/'
+    URL_TOKEN = '/api/v1/auth/token/'
+
+    @pytest.fixture
+    def rates(self, monkeypatch):
+        rates = {
+            'signup_ip': '5/min',
+            'signup_identity': '2/min',
+            'token_ip': '5/min',
+            'token_identity': '2/min',
+        }
+        monkeypatch.setattr(throttling, 'AUTH_THROTTLE_RATES', rates)
+        return rates
+
+    def signup(self, client, idx, **kwargs):
+        return client.post(self.URL_SIGNUP, data={
+            'username': f'user{idx}', 'email': f'user{idx}@yamdb.fake'
+        }, **kwargs)
+
+    def test_01_signup_identity_and_ip(self, client, rates):
+        for _ in range(2):
+            assert self.signup(client, 0).status_code == HTTPStatus.OK
+        response = self.signup(client, 0, REMOTE_ADDR='10.0.0.2')
+        assert response.status_code == HTTPStatus.TOO_MANY_REQUESTS, (
+            'Проверьте, что повторные запросы регистрации с тем же '
+            'username ограничиваются независимо от IP-адреса.'
+        )
+        assert int(response['Retry-After']) > 0
+
+        for idx in range(1, 4):
+            assert self.signup(client, idx).status_code == HTTPStatus.OK
+        response = self.signup(client, 4)
+        assert response.status_code == HTTPStatus.TOO_MANY_REQUESTS, (
+            'Проверьте, что запросы регистрации ограничиваются по IP-адресу.'
+        )
+        assert self.signup(
+            client, 4, REMOTE_ADDR='10.0.0.3'
+        ).status_code == HTTPStatus.OK
+
+    def test_02_token_and_refill(self, client, user, rates, monkeypatch):
+        data = {'username': user.username, 'confirmation_code': 'wrong'}
+        for _ in range(2):
+            response = client.post(self.URL_TOKEN, data=data)
+            assert response.status_code == HTTPStatus.BAD_REQUEST
+        response = client.post(self.URL_TOKEN, data=data)
+        assert response.status_code == HTTPStatus.TOO_MANY_REQUESTS, (
+            'Проверьте, что подбор кода подтверждения для одного '
+            'пользователя ограничивается.'
+        )
+
+        now = throttling.time.time()
+        monkeypatch.setattr(throttling.time, 'time', lambda: now + 31)
+        response = client.post(self.URL_TOKEN, data=data)
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            'Проверьте, что корзина запросов пополняется со временем.'
+        )
+
+    def test_03_shared_store_and_benchmark(self, client, rates):
+        assert isinstance(
+            caches[throttling.THROTTLE_CACHE_ALIAS], FileBasedCache
+        ), (
+            'Проверьте, что состояние ограничений хранится в кэше, '
+            'общем для процессов.'
+        )
+        self.signup(client, 0)
+        other_process = FileBasedCache(
+            caches[throttling.THROTTLE_CACHE_ALIAS]._dir, {}
+        )
+        assert other_process._list_cache_files()
+
+        stored = set(other_process._list_cache_files())
+        stdout = StringIO()
+        call_command('throttle_benchmark', requests=10, stdout=stdout)
+        assert 'SignUpView' in stdout.getvalue()
+        assert set(other_process._list_cache_files()) == stored, (
+            'Проверьте, что замер не пишет в рабочий кэш ограничений.'
+        )
+
+    def test_04_forwarded_for_is_ignored(self, client, rates):
+        for idx in range(5):
+            assert self.signup(
+                client, idx, HTTP_X_FORWARDED_FOR=f'203.0.113.{idx}'
+            ).status_code == HTTPStatus.OK
+        response = self.signup(
+            client, 5, HTTP_X_FORWARDED_FOR='203.0.113.5'
+        )
+        assert response.status_code == HTTPStatus.TOO_MANY_REQUESTS, (
+            'Проверьте, что ограничение по IP-адресу нельзя обойти '
+            'подменой заголовка X-Forwarded-For.'
+        )
+
+    @pytest.mark.parametrize('url', (URL_SIGNUP, URL_TOKEN))
+    def test_05_non_object_body(self, client, rates, url):
+        for data in ([{'username': 'user'}], '"user"'):
+            response = client.post(
+                url, data=data, content_type='application/json'
+            )
+            assert response.status_code == HTTPStatus.BAD_REQUEST, (
+                f'Проверьте, что POST-запрос к `{url}` с телом, которое '
+                'не является объектом, возвращает ответ со статусом 400.'
+            )
+        response = client.post(
+            url, data=[], content_type='application/json'
+        )
+        assert response.status_code == HTTPStatus.TOO_MANY_REQUESTS, (
+            'Проверьте, что такие запросы ограничиваются по IP-адресу.'
+        )
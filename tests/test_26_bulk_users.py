@@ -0,0 +1,97 @@
+from http import HTTPStatus
+
+import pytest
+from django.core import mail
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from users.models import OutgoingEmail
+
+
+@pytest.mark.django_db(transaction=True)
+class Test26BulkUsers:
+
+    BULK_URL = '/api/v1/users/bulk/'
+    USERS_URL = '/api/v1/users/'
+
+    def test_01_json_import_and_errors(self, admin_client, admin,
+                                       django_user_model):
+        admin_client.get(self.USERS_URL)
+        data = [
+            {'username': 'critic1', 'email': 'critic1@yamdb.fake'},
+            {'username': 'critic2', 'email': 'critic2@yamdb.fake',
+             'role': 'moderator'},
+            {'username': 'critic1', 'email': 'other@yamdb.fake'},
+            {'username': admin.username, 'email': 'new@yamdb.fake'},
+            {'username': 'me', 'email': 'me@yamdb.fake'},
+            {'username': 'critic3', 'email': 'not-an-email'},
+        ]
+        response = admin_client.post(self.BULK_URL, data=data, format='json')
+        assert response.status_code == HTTPStatus.CREATED, (
+            f'Проверьте, что POST-запрос администратора к `{self.BULK_URL}` '
+            'с корректными пользователями возвращает ответ со статусом 201.'
+        )
+        assert response.json()['created'] == 2
+        errors = {
+            error['index']: error['errors']
+            for error in response.json()['errors']
+        }
+        assert list(errors) == [2, 3, 4, 5], (
+            'Проверьте, что ответ содержит ошибки по индексам строк.'
+        )
+        assert errors[2] == {'username': ['Username уже занят.']}
+        assert 'username' in errors[3]
+        assert django_user_model.objects.get(
+            username='critic2'
+        ).role == 'moderator'
+        assert not django_user_model.objects.get(
+            username='critic1'
+        ).has_usable_password()
+        assert admin_client.get(self.USERS_URL).json()['count'] == 3, (
+            'Проверьте, что импорт сбрасывает кэш списка пользователей.'
+        )
+        assert not OutgoingEmail.objects.exists()
+
+    def test_02_csv_import_with_emails(self, admin_client, django_user_model):
+        rows = ['username,email,first_name'] + [
+            f'user{idx},user{idx}@yamdb.fake,Имя {idx}' for idx in range(50)
+        ]
+        with CaptureQueriesContext(connection) as context:
+            response = admin_client.post(
+                f'{self.BULK_URL}?send_emails=true',
+                data='\n'.join(rows).encode('utf-8'),
+                content_type='text/csv',
+            )
+        assert response.status_code == HTTPStatus.CREATED, response.json()
+        assert response.json() == {'created': 50, 'errors': []}
+        assert len(context) <= 10, (
+            'Проверьте, что импорт пользователей выполняется запросами '
+            'на пачку строк, а не на каждую строку.'
+        )
+        assert django_user_model.objects.get(
+            username='user7'
+        ).first_name == 'Имя 7'
+        assert OutgoingEmail.objects.count() == 50
+        call_command('send_outbox')
+        assert {message.to[0] for message in mail.outbox} == {
+            f'user{idx}@yamdb.fake' for idx in range(50)
+        }
+
+    def test_03_validation_and_permissions(self, user_client, admin_client):
+        data = [{'username': 'critic', 'email': 'critic@yamdb.fake'}]
+        assert user_client.post(
+            self.BULK_URL, data=data, format='json'
+        ).status_code == HTTPStatus.FORBIDDEN, (
+            'Проверьте, что массовый импорт доступен только администратору.'
+        )
+        for invalid in ([], {'username': 'critic'}):
+            response = admin_client.post(
+                self.BULK_URL, data=invalid, format='json'
+            )
+            assert response.status_code == HTTPStatus.BAD_REQUEST
+        response = admin_client.post(
+            self.BULK_URL, data=[{'username': 'critic'}], format='json'
+        )
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        assert 'email' in response.json()['errors'][0]['errors']
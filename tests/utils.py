@@ -1,5 +1,8 @@
 from http import HTTPStatus
 
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
 
 check_name_and_slug_patterns = (
     (
@@ -102,6 +105,20 @@ invalid_data_for_user_patch_and_creation.extend([
 ])
 
 
+def capture_queries(client, url, method='get', data=None, match=None,
+                    **kwargs):
+    """Ответ на запрос и SQL выполненных при этом запросов к БД.
+
+    Если передан match, возвращаются только запросы с этой подстрокой.
+    """
+    with CaptureQueriesContext(connection) as context:
+        response = getattr(client, method)(url, data=data, **kwargs)
+    return response, [
+        query['sql'] for query in context.captured_queries
+        if match is None or match in query['sql']
+    ]
+
+
 def check_pagination(url, respons_data, expected_count, post_data=None):
     expected_keys = ('count', 'next', 'previous', 'results')
     for key in expected_keys: